@@ -1,6 +1,9 @@
 import streamlit as st
 from streamlit_player import st_player
-from streamlit_pdf_viewer import pdf_viewer
+from pdf_pages import file_bytes, page_count, page_image, prerender_thumbnails, thumbnail
+
+EBOOK_PATH = "stocksinfo.pdf"
+THUMBNAILS_PER_ROW = 6
 
 # Custom button component
 def st_button(label, url, description, icon_size):
@@ -81,9 +84,19 @@ def app():
         st.subheader("E-book")
         # URL of the PDF file
         #pdf_url = "https://industri.fatek.unpatti.ac.id/wp-content/uploads/2019/03/McGraw.Hill_.Understanding-Stocks.pdf"
-        pdf_url = "./stocksinfo.pdf"
-        pdf_display = f'<iframe src="{pdf_url}" width="1000" height="1000" type="application/pdf"></iframe>'
-        st.markdown(pdf_display, unsafe_allow_html=True)
+        # Only the selected page and a row of thumbnails are sent to the browser
+        prerender_thumbnails(EBOOK_PATH)
+        pages = page_count(EBOOK_PATH)
+        page = st.number_input(f'Page (1-{pages})', min_value=1, max_value=pages, value=1)
+        st.image(page_image(EBOOK_PATH, page - 1), use_column_width=True)
+
+        first = min(max(page - 1 - THUMBNAILS_PER_ROW // 2, 0), max(pages - THUMBNAILS_PER_ROW, 0))
+        for column, index in zip(st.columns(THUMBNAILS_PER_ROW), range(first, min(first + THUMBNAILS_PER_ROW, pages))):
+            with column:
+                st.image(thumbnail(EBOOK_PATH, index), caption=f'Page {index + 1}')
+        # Served from Streamlit's media endpoint as application/pdf
+        st.download_button('Download the full e-book', file_bytes(EBOOK_PATH),
+                           file_name='stocksinfo.pdf', mime='application/pdf')
 
 if __name__ == "__main__":
     app()
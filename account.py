@@ -1,14 +1,10 @@
 import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, auth
-
-# Initialize Firebase Admin SDK if not already initialized
-if not firebase_admin._apps:
-    cred = credentials.Certificate('ramalsahamanda-ef9e255aa6e7.json')
-    firebase_admin.initialize_app(cred)
+from firebase_client import get_app
+from user_profiles import create_user, sign_in
 
 def app():
     st.title('Welcome to RamalSahamAnda')
+    get_app()
 
     # Initialize session state variables
     if 'username' not in st.session_state:
@@ -23,10 +19,10 @@ def app():
     # Define login and signout functions
     def login():
         try:
-            user = auth.get_user_by_email(email)
+            profile = sign_in(email, password)
             st.success('Login Successful')
-            st.session_state.username = user.display_name if user.display_name else user.uid
-            st.session_state.useremail = user.email
+            st.session_state.username = profile.display_name if profile.display_name else profile.uid
+            st.session_state.useremail = profile.email
             st.session_state.signout = True
             st.session_state.signedout = True
         except Exception as e:
@@ -55,7 +51,7 @@ def app():
 
             if st.button('Create my account'):
                 try:
-                    user = auth.create_user(email=email, password=password, display_name=username)
+                    create_user(email, password, username)
                     st.success('Account created successfully! Please log in.')
                     st.balloons()
                 except Exception as e:
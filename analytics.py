@@ -0,0 +1,67 @@
+"""Streamlit-free analysis stages shared by the dashboard and batch_runner."""
+import numpy as np
+import pandas as pd
+
+import keras_engine
+from batch_analytics import TRADING_DAYS
+from market_data import get_price_history
+from prediction import fit_linear_model, prepare_features
+
+
+def add_daily_change(data):
+    data = data.copy()
+    data['% Change'] = data['Adj Close'].pct_change()
+    data.dropna(inplace=True)
+    return data
+
+
+def pricing_metrics(data):
+    """Annual return, volatility and their ratio from a frame with '% Change'."""
+    annual_return = data['% Change'].mean() * TRADING_DAYS * 100
+    stdev = data['% Change'].std() * np.sqrt(TRADING_DAYS)
+    return {
+        'Annual Return': annual_return,
+        'Standard Deviation': stdev,
+        'Risk Adjusted Return': annual_return / stdev,
+    }
+
+
+def linear_forecast(ticker, data):
+    """Return (data with Predicted, predict_future(days)) from the cached linear model."""
+    # Cached per ticker; slider moves only call predict, new bars update it incrementally
+    data, model = fit_linear_model(ticker, data)
+    last_day = data['Days'].max()
+
+    def predict_future(days_to_predict):
+        future_days = pd.DataFrame({'Days': np.arange(last_day + 1, last_day + 1 + days_to_predict)})
+        return model.predict(future_days)
+
+    return data, predict_future
+
+
+def keras_forecast(ticker, data):
+    """Same contract as linear_forecast, backed by the shared micro-batched LSTM."""
+    data = prepare_features(data)
+    data['Predicted'] = keras_engine.predict_history(ticker, data)
+    return data, lambda days_to_predict: keras_engine.forecast(ticker, data, days_to_predict)
+
+
+def future_dates(data, days_to_predict):
+    return pd.date_range(start=data['Date'].max() + pd.Timedelta(days=1), periods=days_to_predict, freq='D')
+
+
+def analyze_ticker(ticker, start_date, end_date, days_to_predict=30, forecaster=linear_forecast):
+    """Run fetch, metrics and prediction for one ticker and return a flat result row."""
+    data = add_daily_change(get_price_history(ticker, start_date, end_date))
+    if data.empty:
+        raise ValueError(f"no price data for {ticker}")
+    row = {
+        'Ticker': ticker.upper(),
+        'Start': data.index.min(),
+        'End': data.index.max(),
+        'Last Close': float(data['Adj Close'].iloc[-1]),
+    }
+    row.update(pricing_metrics(data))
+    data, predict_future = forecaster(ticker, data)
+    row[f'Predicted {days_to_predict}d'] = float(predict_future(days_to_predict)[-1])
+    return row
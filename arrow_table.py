@@ -0,0 +1,75 @@
+"""Arrow-backed table views with sorting, filtering and paging on the server.
+
+A frame is converted to Arrow once and cached by content hash. Sorted and
+filtered views are cached as well, so turning a page is a zero-copy slice
+and only the visible rows are converted back to pandas and sent to the
+browser.
+"""
+import hashlib
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ttl_cache import TTLCache
+
+PAGE_SIZE = 50
+
+_tables = TTLCache(maxsize=64, ttl=900)
+_views = TTLCache(maxsize=256, ttl=900)
+
+
+def _normalize(data):
+    # Object columns can mix ints and strings (e.g. statements with 'None'
+    # entries), which Arrow refuses to convert; show them as text like st.write
+    objects = data.select_dtypes('object').columns
+    data = data.astype({column: str for column in objects})
+    if data.index.dtype == object:
+        data.index = data.index.astype(str)
+    return data
+
+
+def _content_key(data):
+    """Hash of the values in row order, plus the column names and dtypes."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+    digest.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode())
+    digest.update(str(data.index.dtype).encode())
+    return digest.hexdigest()
+
+
+def to_arrow(data):
+    """Return (key, table) for `data`, converting it only the first time it is seen.
+
+    The index becomes the table's first column so it can be sorted and
+    filtered like any other column.
+    """
+    data = _normalize(data)
+    key = _content_key(data)
+    table = _tables.get(key)
+    if table is None:
+        frame = data.rename_axis(data.index.name or 'Row').reset_index()
+        frame.columns = [str(column) for column in frame.columns]
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        _tables.set(key, table)
+    return key, table
+
+
+def view(key, table, sort_by=None, descending=False, filter_text=''):
+    """Return `table` filtered to rows whose first column contains `filter_text`, then sorted."""
+    view_key = (key, sort_by, descending, filter_text)
+    result = _views.get(view_key)
+    if result is None:
+        result = table
+        if filter_text:
+            labels = pc.cast(result.column(0), pa.string())
+            result = result.filter(pc.fill_null(pc.match_substring(labels, filter_text, ignore_case=True), False))
+        if sort_by:
+            result = result.take(pc.sort_indices(result, sort_keys=[(sort_by, 'descending' if descending else 'ascending')]))
+        _views.set(view_key, result)
+    return result
+
+
+def page(table, number, page_size=PAGE_SIZE):
+    """Return page `number` (0-based) of `table` as a DataFrame indexed like the original."""
+    frame = table.slice(number * page_size, page_size).to_pandas()
+    return frame.set_index(frame.columns[0])
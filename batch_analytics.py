@@ -0,0 +1,96 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+METRICS = ('% Change', 'Annual Return', 'Standard Deviation', 'Risk Adjusted Return')
+
+
+def price_matrix(prices_by_ticker, column='Adj Close'):
+    """Align per-ticker price frames into (dates, tickers, T x N array).
+
+    Dates a ticker did not trade on (other exchanges' holidays, later
+    listings) are NaN in its column.
+    """
+    frame = pd.concat({ticker: data[column] for ticker, data in prices_by_ticker.items()}, axis=1).sort_index()
+    return frame.index, list(frame.columns), frame.to_numpy(dtype=float)
+
+
+def daily_returns(prices):
+    """Return the (T - 1) x N matrix of daily % changes.
+
+    Gaps are skipped rather than filled, so each return runs from a ticker's
+    previous trading day, and days it did not trade stay NaN.
+    """
+    valid = ~np.isnan(prices)
+    rows = np.where(valid, np.arange(len(prices))[:, np.newaxis], 0)
+    filled = prices[np.maximum.accumulate(rows, axis=0), np.arange(prices.shape[1])]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = filled[1:] / filled[:-1] - 1
+    returns[~valid[1:]] = np.nan
+    return returns
+
+
+def _summarize(mean, std):
+    annual_return = mean * TRADING_DAYS * 100
+    stdev = std * np.sqrt(TRADING_DAYS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risk_adjusted = annual_return / stdev
+    return annual_return, stdev, risk_adjusted
+
+
+def compute_metrics(prices):
+    """Pricing Data tab metrics for every column of a T x N price matrix at once."""
+    valid = ~np.isnan(prices)
+    columns = np.arange(prices.shape[1])
+    first = prices[valid.argmax(axis=0), columns]
+    last = prices[len(prices) - 1 - valid[::-1].argmax(axis=0), columns]
+    returns = daily_returns(prices)
+    with warnings.catch_warnings():
+        # All-NaN columns (tickers without data) just come out as NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(returns, axis=0)
+        std = np.nanstd(returns, axis=0, ddof=1)
+    annual_return, stdev, risk_adjusted = _summarize(mean, std)
+    return {
+        '% Change': (last / first - 1) * 100,
+        'Annual Return': annual_return,
+        'Standard Deviation': stdev,
+        'Risk Adjusted Return': risk_adjusted,
+    }
+
+
+def rolling_metrics(prices, window):
+    """Rolling versions of the metrics over `window` daily returns.
+
+    Each output row i covers returns i .. i + window - 1 and lines up with
+    dates[window + i]. Windows are computed from cumulative sums, so the cost
+    does not depend on the window length.
+    """
+    returns = daily_returns(prices)
+    valid = ~np.isnan(returns)
+    values = np.where(valid, returns, 0.0)
+
+    def rolling_sum(a):
+        totals = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+        return totals[window:] - totals[:-window]
+
+    count = rolling_sum(valid.astype(float))
+    total = rolling_sum(values)
+    squares = rolling_sum(values * values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        variance = np.maximum(squares - total * mean, 0) / (count - 1)
+    mean[count < 2] = np.nan
+    variance[count < 2] = np.nan
+    annual_return, stdev, risk_adjusted = _summarize(mean, np.sqrt(variance))
+    return {
+        'Annual Return': annual_return,
+        'Standard Deviation': stdev,
+        'Risk Adjusted Return': risk_adjusted,
+    }
+
+
+def metrics_frame(tickers, metrics):
+    return pd.DataFrame(metrics, index=pd.Index(tickers, name='Ticker'))
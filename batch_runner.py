@@ -0,0 +1,84 @@
+"""Run the dashboard analytics for a list of tickers without Streamlit.
+
+Example (e.g. from a nightly cron job before market open):
+
+    python batch_runner.py AAPL MSFT --tickers-file watchlist.txt --output results.parquet
+
+Prices land in the shared on-disk price store as a side effect, so the
+next interactive page load for these tickers reads from disk.
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+from analytics import analyze_ticker
+
+
+def _run_one(ticker, start_date, end_date, days_to_predict):
+    try:
+        return analyze_ticker(ticker, start_date, end_date, days_to_predict)
+    except Exception as e:
+        return {'Ticker': ticker.upper(), 'Error': str(e)}
+
+
+def run(tickers, start_date, end_date, days_to_predict=30, workers=None):
+    """Analyze every ticker on a process pool and return one row per ticker."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(_run_one, tickers, [start_date] * len(tickers),
+                             [end_date] * len(tickers), [days_to_predict] * len(tickers)))
+    return pd.DataFrame(rows).set_index('Ticker')
+
+
+def warm_fundamentals(tickers):
+    """Fill the fundamentals cache; runs in this process so the rate limit holds."""
+    import fundamentals
+    for ticker in tickers:
+        for statement in fundamentals.STATEMENTS:
+            try:
+                fundamentals.get_statement(ticker, statement)
+            except Exception as e:
+                print(f"{ticker} {statement}: {e}", file=sys.stderr)
+
+
+def read_tickers(args):
+    tickers = [ticker.upper() for ticker in args.tickers]
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip().upper() for line in f if line.strip() and not line.startswith('#')]
+    return list(dict.fromkeys(tickers))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('tickers', nargs='*', help='ticker symbols')
+    parser.add_argument('--tickers-file', help='file with one ticker per line')
+    parser.add_argument('--start', default='2020-01-01', type=date.fromisoformat)
+    parser.add_argument('--end', default=date.today(), type=date.fromisoformat)
+    parser.add_argument('--days', default=30, type=int, help='days to predict')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--output', default='results.parquet', help='.parquet or .csv output path')
+    parser.add_argument('--warm-fundamentals', action='store_true',
+                        help='also fill the Alpha Vantage statement cache (slow, rate limited)')
+    args = parser.parse_args(argv)
+
+    tickers = read_tickers(args)
+    if not tickers:
+        parser.error('no tickers given')
+
+    results = run(tickers, args.start, args.end, args.days, args.workers)
+    if args.output.endswith('.csv'):
+        results.to_csv(args.output)
+    else:
+        results.to_parquet(args.output)
+    failed = results['Error'].notna().sum() if 'Error' in results else 0
+    print(f"Wrote {len(results)} tickers to {args.output} ({failed} failed)")
+
+    if args.warm_fundamentals:
+        warm_fundamentals(tickers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Charts and tables that send the browser only what it can show."""
+import math
+
+import plotly.express as px
+import streamlit as st
+
+from arrow_table import PAGE_SIZE, page, to_arrow, view
+from downsample import CHART_POINTS, downsample
+
+
+def line_chart(data, x, y, key, **kwargs):
+    """Draw `y` against `x` (None for the index) with px.line, downsampled.
+
+    Long series get a range slider under the chart. Narrowing it re-queries
+    the window at full chart resolution, so zoomed views show the detail
+    that downsampling dropped from the full range.
+    """
+    if len(data) > CHART_POINTS:
+        values = data.index if x is None else data[x]
+        first, last = values.min().to_pydatetime(), values.max().to_pydatetime()
+        start, end = st.slider('Zoom', min_value=first, max_value=last, value=(first, last), format='YYYY-MM-DD', key=key)
+        data = downsample(data, x, y, start=start, end=end)
+    fig = px.line(data, x=data.index if x is None else x, y=y, **kwargs)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def paged_table(data, key, page_size=PAGE_SIZE):
+    """Show `data` one page at a time, sorting and filtering on the server.
+
+    The frame is converted to Arrow once per content hash. Each rerun sends
+    only the current page instead of the whole frame.
+    """
+    table_key, table = to_arrow(data)
+    columns = table.column_names
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        filter_text = st.text_input(f'Filter {columns[0]}', key=f'{key}_filter')
+    with col2:
+        sort_by = st.selectbox('Sort by', [None] + columns, format_func=lambda c: 'Original order' if c is None else c, key=f'{key}_sort')
+    with col3:
+        descending = st.toggle('Descending', key=f'{key}_descending')
+
+    rows = view(table_key, table, sort_by, descending, filter_text)
+    pages = max(1, math.ceil(rows.num_rows / page_size))
+    number = st.number_input('Page', min_value=1, max_value=pages, value=1, key=f'{key}_page') if pages > 1 else 1
+    # Clamp the page in case a new filter left fewer pages than the widget remembers
+    number = min(number, pages)
+    st.dataframe(page(rows, number - 1, page_size), use_container_width=True)
+    first = (number - 1) * page_size
+    st.caption(f"Rows {min(first + 1, rows.num_rows)}-{min(first + page_size, rows.num_rows)} of {rows.num_rows}")
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import re
+
+from ttl_cache import TTLCache
+
+# Rough budget for what is sent per turn, including the summary of older turns
+CONTEXT_TOKENS = 2000
+SUMMARY_TOKENS = 300
+SUMMARY_LINE_CHARS = 160
+
+# Answers shared by every session in the process
+response_cache = TTLCache(maxsize=2000, ttl=24 * 3600)
+
+
+def estimate_tokens(text):
+    # About four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def _first_sentence(text):
+    sentence = re.split(r'(?<=[.!?])\s', text.strip(), maxsplit=1)[0]
+    return sentence[:SUMMARY_LINE_CHARS]
+
+
+def summarize(messages, budget=SUMMARY_TOKENS):
+    """One line per older message, newest kept first when the budget runs out."""
+    lines = []
+    used = 0
+    for message in reversed(messages):
+        speaker = "User" if message["role"] == "user" else "Assistant"
+        line = f"- {speaker}: {_first_sentence(message['content'])}"
+        used += estimate_tokens(line)
+        if used > budget:
+            break
+        lines.append(line)
+    return "\n".join(reversed(lines))
+
+
+def build_context(messages, budget=CONTEXT_TOKENS, summary_budget=SUMMARY_TOKENS):
+    """Return the messages to send for the latest turn.
+
+    The newest messages are kept verbatim while they fit in the budget. The
+    last message always does. Anything older is folded into one summary
+    message, so the payload stays bounded however long the chat runs.
+    """
+    recent = []
+    used = 0
+    for message in reversed(messages):
+        cost = estimate_tokens(message["content"])
+        if recent and used + cost > budget - summary_budget:
+            break
+        recent.append(message)
+        used += cost
+    recent.reverse()
+
+    older = messages[:len(messages) - len(recent)]
+    if not older:
+        return recent
+    summary = {"role": "system", "content": "Summary of the earlier conversation:\n" + summarize(older, summary_budget)}
+    return [summary] + recent
+
+
+def normalize_prompt(prompt):
+    text = re.sub(r"[^\w\s/%$.-]", " ", prompt.lower())
+    return " ".join(text.split()).strip(" .")
+
+
+def response_key(model, prompt, context):
+    """Cache key for an answer: model, normalized prompt and a hash of the context before it."""
+    digest = hashlib.sha256(json.dumps(context, sort_keys=True).encode()).hexdigest()
+    return model, normalize_prompt(prompt), digest
@@ -0,0 +1,101 @@
+"""Answer ticker/metric questions from local market data before asking the LLM."""
+import re
+from datetime import date
+
+from analytics import add_daily_change, pricing_metrics
+from market_data import get_price_history, get_ticker_info, is_known_ticker
+
+# Same default range as the Stock Prediction page, so the numbers match it
+DEFAULT_START = date(2020, 1, 1)
+
+# Checked in order, so the more specific phrases come first
+METRIC_PATTERNS = [
+    ('Risk Adjusted Return', r'risk[- ]adjusted|sharpe'),
+    ('Standard Deviation', r'standard deviation|volatil|\bstdev\b|\brisk\b'),
+    ('Annual Return', r'annual(ized)? return|yearly return|\breturns?\b'),
+    ('marketCap', r'market cap'),
+    ('trailingPE', r'\bp/?e\b|price[- ]to[- ]earnings'),
+    ('dividendYield', r'dividend'),
+    ('currentPrice', r'\bprice\b|trading at|\bquote\b'),
+]
+
+# Only plain lookups ("what is $AAPL's P/E?") are answered locally; advice,
+# explanations and how-to questions mention metrics too but need the LLM
+LOOKUP_QUESTION = r"^\s*(what(?:'s|\s+is|\s+was|\s+are)|how\s+(?:much|high|big)\s+is|tell\s+me|give\s+me|show\s+me)\b"
+OPEN_ENDED = r"\b(why|should|would|could|explain|calculate|recommend|worth|good|buy|sell|predict|forecast|expect)\b"
+
+NOT_TICKERS = {
+    'I', 'A', 'AN', 'THE', 'PE', 'P', 'E', 'EPS', 'ETF', 'IPO', 'CEO', 'USA', 'US', 'AI',
+    'OK', 'IS', 'OF', 'ON', 'IN', 'AND', 'OR', 'WHAT', 'HOW', 'YTD', 'NYSE', 'NASDAQ',
+}
+
+
+def find_ticker(text):
+    """Return a `$TICKER`, or the first bare symbol already in the local stores.
+
+    Bare capitalized words like ROE or GDP are only taken as tickers once
+    the symbol is known locally, so a false match never triggers a download.
+    """
+    match = re.search(r'\$([A-Za-z]{1,5}(?:\.[A-Za-z]{1,2})?)\b', text)
+    if match:
+        return match.group(1).upper()
+    for word in re.findall(r"\b[A-Z]{1,5}(?:\.[A-Z]{1,2})?\b", text):
+        if word not in NOT_TICKERS and is_known_ticker(word):
+            return word
+    return None
+
+
+def is_lookup(text):
+    return bool(re.search(LOOKUP_QUESTION, text, re.IGNORECASE)) and not re.search(OPEN_ENDED, text, re.IGNORECASE)
+
+
+def find_metric(text):
+    text = text.lower()
+    for metric, pattern in METRIC_PATTERNS:
+        if re.search(pattern, text):
+            return metric
+    return None
+
+
+def _format_info(ticker, info, metric):
+    name = info.get('shortName', ticker)
+    value = info.get(metric)
+    if value is None:
+        return None
+    if metric == 'currentPrice':
+        return f"The current price of {name} ({ticker}) is ${value:.2f}."
+    if metric == 'marketCap':
+        return f"The market cap of {name} ({ticker}) is ${value:,}."
+    if metric == 'trailingPE':
+        return f"The trailing P/E ratio of {name} ({ticker}) is {value:.2f}."
+    return f"The dividend yield of {name} ({ticker}) is {value:.2%}."
+
+
+def _format_metric(ticker, metrics, metric, start_date, end_date):
+    period = f"from {start_date:%d %b %Y} to {end_date:%d %b %Y}"
+    if metric == 'Annual Return':
+        return f"{ticker}'s annualized return {period} is {metrics[metric]:.2f}%."
+    if metric == 'Standard Deviation':
+        return f"{ticker}'s annualized standard deviation {period} is {metrics[metric]:.2%}."
+    return f"{ticker}'s risk-adjusted return (annual return / standard deviation) {period} is {metrics[metric]:.2f}."
+
+
+def answer(prompt, start_date=DEFAULT_START, end_date=None):
+    """Return an exact answer for a ticker/metric question, or None to fall back to the LLM."""
+    if not is_lookup(prompt):
+        return None
+    ticker = find_ticker(prompt)
+    metric = find_metric(prompt)
+    if ticker is None or metric is None:
+        return None
+    end_date = end_date or date.today()
+    try:
+        if metric in ('currentPrice', 'marketCap', 'trailingPE', 'dividendYield'):
+            return _format_info(ticker, get_ticker_info(ticker), metric)
+        data = add_daily_change(get_price_history(ticker, start_date, end_date))
+        if len(data) < 2:
+            return None
+        return _format_metric(ticker, pricing_metrics(data), metric, start_date, end_date)
+    except Exception:
+        # Unknown symbols and upstream errors are left to the LLM
+        return None
@@ -1,5 +1,10 @@
+import threading
+
 import openai
 import streamlit as st
+from chat_context import build_context, response_cache, response_key
+from chat_router import answer as answer_from_market_data
+from llm import complete_chat, stream_chat
 
 st.title("Ask Me Bot")
 
@@ -17,32 +22,64 @@ if "openai_model" not in st.session_state:
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+stream_responses = st.sidebar.toggle("Stream responses", value=True)
+cache_stats = response_cache.stats()
+st.sidebar.caption(f"Answer cache: {cache_stats['size']} answers, {cache_stats['hit_rate']:.0%} hit rate")
+
 # Display existing chat messages
 for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+    if message["content"]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
 
 # Input for new user message
 prompt = st.chat_input("What is up?")
 if prompt:
+    # A new message cancels any answer this session is still streaming
+    if "cancel_event" in st.session_state:
+        st.session_state.cancel_event.set()
+    cancel_event = st.session_state.cancel_event = threading.Event()
+
     with st.chat_message("user"):
         st.markdown(prompt)
     st.session_state.messages.append({"role": "user", "content": prompt})
+    # Send a bounded window: recent turns verbatim, older ones summarized
+    history = build_context([
+        {"role": m["role"], "content": m["content"]}
+        for m in st.session_state.messages
+        if m["content"]
+    ])
+    cache_key = response_key(st.session_state["openai_model"], prompt, history[:-1])
+    # Ticker/metric questions get exact numbers from local market data; repeats come from the cache
+    cached_response = answer_from_market_data(prompt) or response_cache.get(cache_key)
 
     # Get response from OpenAI
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
         full_response = ""
-        
-        response = openai.ChatCompletion.create(
-            model=st.session_state["openai_model"],
-            messages=[
-                {"role": m["role"], "content": m["content"]}
-                for m in st.session_state.messages
-            ]
-        )
-        
-        full_response = response.choices[0].message["content"]
-        message_placeholder.markdown(full_response)
-    
-    st.session_state.messages.append({"role": "assistant", "content": full_response})
+
+        if cached_response is not None:
+            full_response = cached_response
+            message_placeholder.markdown(full_response)
+            st.session_state.messages.append({"role": "assistant", "content": full_response})
+        elif stream_responses:
+            # Stored up front and filled in as chunks arrive, so a cancelled answer keeps what was said
+            answer = {"role": "assistant", "content": ""}
+            st.session_state.messages.append(answer)
+            chunks = stream_chat(history, st.session_state["openai_model"], cancel_event)
+            try:
+                for chunk in chunks:
+                    full_response += chunk
+                    answer["content"] = full_response
+                    message_placeholder.markdown(full_response + "▌")
+            finally:
+                # Streamlit stops an interrupted run mid-loop; close the HTTP stream with it
+                chunks.close()
+            message_placeholder.markdown(full_response)
+            if not cancel_event.is_set():
+                response_cache.set(cache_key, full_response)
+        else:
+            full_response = complete_chat(history, st.session_state["openai_model"])
+            message_placeholder.markdown(full_response)
+            st.session_state.messages.append({"role": "assistant", "content": full_response})
+            response_cache.set(cache_key, full_response)
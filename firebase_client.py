@@ -0,0 +1,87 @@
+"""Process-wide Firebase app and Firestore client shared by every page and session."""
+import os
+import threading
+import time
+
+import firebase_admin
+from firebase_admin import credentials
+
+CREDENTIALS_PATH = os.environ.get("FIREBASE_CREDENTIALS", "ramalsahamanda-ef9e255aa6e7.json")
+# How often a borrowed client is checked with a cheap read
+HEALTH_CHECK_INTERVAL = 60
+
+_lock = threading.RLock()
+_firestore = None
+_checked_at = 0.0
+# Replaced clients, closed once nothing holds them any more
+_retired = []
+
+
+def get_app(credentials_path=CREDENTIALS_PATH):
+    """Initialize the default Firebase app on first use and return it."""
+    with _lock:
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app(credentials.Certificate(credentials_path))
+        return firebase_admin.get_app()
+
+
+def _new_client():
+    # Imported here so pages that never touch Firestore do not pay for gRPC.
+    # firebase_admin.firestore.client() caches one client per app and would
+    # hand back the unhealthy client, so replacements are built directly.
+    from google.cloud import firestore
+    app = get_app()
+    return firestore.Client(project=app.project_id, credentials=app.credential.get_credential())
+
+
+def get_firestore(check=True):
+    """Return the shared Firestore client, creating it on first use.
+
+    One client, and so one gRPC channel, serves the whole process. With
+    `check`, a client that fails its periodic health check is replaced
+    before it is handed out. The check runs outside the lock, so a slow
+    Firestore stalls only the caller that runs it. The old client stays
+    open until close_retired is told its long-lived holders (the post feed
+    and writer) have moved to the new one.
+    """
+    global _firestore, _checked_at
+    with _lock:
+        if _firestore is None:
+            _firestore = _new_client()
+            _checked_at = time.monotonic()
+            return _firestore
+        client = _firestore
+        due = check and time.monotonic() - _checked_at > HEALTH_CHECK_INTERVAL
+        if due:
+            # Claimed here so only one caller per interval runs the check
+            _checked_at = time.monotonic()
+    if due and not health_check(client):
+        replacement = _new_client()
+        with _lock:
+            if _firestore is client:
+                _retired.append(client)
+                _firestore = replacement
+            else:
+                _retired.append(replacement)
+    with _lock:
+        return _firestore
+
+
+def close_retired(*in_use):
+    """Close replaced clients that none of `in_use` still hold."""
+    with _lock:
+        closing = [client for client in _retired if all(client is not held for held in in_use)]
+        _retired[:] = [client for client in _retired if client not in closing]
+    for client in closing:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def health_check(client, timeout=5):
+    try:
+        client.collection('Posts').limit(1).get(timeout=timeout)
+        return True
+    except Exception:
+        return False
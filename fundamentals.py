@@ -0,0 +1,172 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from io import StringIO
+
+import pandas as pd
+from alpha_vantage.alphavantage import AlphaVantage
+from alpha_vantage.fundamentaldata import FundamentalData
+
+CACHE_DIR = os.environ.get("FUNDAMENTALS_CACHE_DIR", ".fundamentals_cache")
+API_KEY = os.environ.get("ALPHA_VANTAGE_KEY", '1VZ9G6S9P6TTKQLF')
+# Point the client at another server, e.g. a local fake FundamentalData service in tests
+API_URL = os.environ.get("ALPHA_VANTAGE_URL")
+REQUESTS_PER_MINUTE = float(os.environ.get("ALPHA_VANTAGE_RPM", 5))
+
+STATEMENTS = ('balance_sheet', 'income_statement', 'cash_flow')
+
+# Annual statements change a few times a year: refresh weekly, but keep serving
+# an older copy for up to a quarter while the refresh waits for quota
+FRESH_FOR = 7 * 24 * 3600
+USABLE_FOR = 90 * 24 * 3600
+
+if API_URL:
+    AlphaVantage._ALPHA_VANTAGE_API_URL = API_URL
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+class RequestScheduler:
+    """Runs upstream requests one at a time, paced by a token bucket.
+
+    Requests are queued by key; a request for a key that is already queued
+    or in flight gets the same Future instead of a second upstream call.
+    """
+
+    def __init__(self, fetch, bucket):
+        self.fetch = fetch
+        self.bucket = bucket
+        self.coalesced = 0
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, *key):
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._pending[key] = Future()
+            self._queue.put(key)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="fundamentals-scheduler", daemon=True)
+                self._worker.start()
+        return future
+
+    def queued(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            future = self._pending[key]
+            self.bucket.acquire()
+            try:
+                future.set_result(self.fetch(*key))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._pending[key]
+
+
+class FundamentalsCache:
+    """On-disk statements, one JSON file per ticker and statement type."""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def _path(self, ticker, statement):
+        return os.path.join(self.root, f"{ticker.upper()}_{statement}.json")
+
+    def read(self, ticker, statement):
+        """Return (statement frame, age in seconds), or (None, None) if not cached."""
+        path = self._path(ticker, statement)
+        if not os.path.exists(path):
+            return None, None
+        with open(path) as f:
+            entry = json.load(f)
+        # No dtype or date inference, so a cache hit matches the upstream frame
+        data = pd.read_json(StringIO(entry["data"]), orient='split', dtype=False, convert_dates=False)
+        return data, time.time() - entry["fetched_at"]
+
+    def write(self, ticker, statement, data):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(ticker, statement)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"fetched_at": time.time(), "data": data.to_json(orient='split')}, f)
+        os.replace(path + ".tmp", path)
+
+
+def fetch_statement(ticker, statement):
+    fd = FundamentalData(API_KEY, output_format='pandas')
+    return getattr(fd, f'get_{statement}_annual')(ticker)[0]
+
+
+def _fetch_and_store(ticker, statement):
+    data = fetch_statement(ticker, statement)
+    cache.write(ticker, statement, data)
+    return data
+
+
+cache = FundamentalsCache()
+scheduler = RequestScheduler(_fetch_and_store, TokenBucket(REQUESTS_PER_MINUTE / 60, REQUESTS_PER_MINUTE))
+
+
+def submit_statement(ticker, statement):
+    """Return a Future for an annual statement without blocking on the scheduler.
+
+    Fresh cached copies come back as a completed Future. A stale but usable
+    copy is returned the same way while a refresh is queued in the
+    background; anything else is the scheduler's Future for its turn in the
+    rate-limited queue.
+    """
+    future = Future()
+    try:
+        if statement not in STATEMENTS:
+            raise ValueError(f"Unknown statement type: {statement}")
+        data, age = cache.read(ticker, statement)
+    except Exception as e:
+        future.set_exception(e)
+        return future
+    if data is not None and age < FRESH_FOR:
+        future.set_result(data)
+        return future
+    pending = scheduler.submit(ticker.upper(), statement)
+    if data is not None and age < USABLE_FOR:
+        future.set_result(data)
+        return future
+    return pending
+
+
+def get_statement(ticker, statement, timeout=None):
+    """Return an annual statement ('balance_sheet', 'income_statement' or 'cash_flow')."""
+    return submit_statement(ticker, statement).result(timeout)
@@ -1,12 +1,11 @@
-import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
-from datetime import datetime
+import queue
 
-# Initialize Firebase Admin SDK
-if not firebase_admin._apps:
-    cred = credentials.Certificate(r"ramalsahamanda-ef9e255aa6e7.json")
-    firebase_admin.initialize_app(cred)
+import streamlit as st
+from firebase_client import close_retired, get_app, get_firestore
+from posts import PAGE_SIZE, display_time, fetch_posts_page, new_post
+from post_feed import discard_post_feed, get_post_feed
+from post_writer import get_post_writer
+from user_profiles import sign_in
 
 def authenticate_user():
     st.title("Login")
@@ -15,10 +14,8 @@ def authenticate_user():
     
     if st.button("Login"):
         try:
-            user = auth.get_user_by_email(email)
-            # This is a placeholder for actual password verification
-            # Firebase Admin SDK doesn't support sign-in with password, so use Firebase client SDK instead
-            st.session_state.user = user
+            # Keep only the small cached profile in session, not the full UserRecord
+            st.session_state.user = sign_in(email, password)
             st.success("Login successful")
             st.experimental_rerun()
         except Exception as e:
@@ -29,13 +26,88 @@ def signout():
         del st.session_state[key]
     st.experimental_rerun()
 
+def reset_feed(page_size):
+    st.session_state.feed_page_size = page_size
+    st.session_state.feed_limit = page_size
+    st.session_state.older_posts = []
+    st.session_state.older_cursor = None
+    st.session_state.older_exhausted = False
+    st.session_state.older_anchor = None
+
+def show_more_posts():
+    st.session_state.feed_limit += st.session_state.feed_page_size
+
+def load_older_posts(db, feed, needed):
+    # Posts past the shared buffer are paged in with cursor queries from its oldest post
+    tail = feed.oldest_snapshot()
+    if st.session_state.older_anchor != tail.id:
+        # New posts pushed the buffer's tail forward; page again from the new
+        # tail so the posts that dropped out of the buffer are not skipped
+        st.session_state.older_posts = []
+        st.session_state.older_cursor = None
+        st.session_state.older_exhausted = False
+        st.session_state.older_anchor = tail.id
+    page_size = st.session_state.feed_page_size
+    while len(st.session_state.older_posts) < needed and not st.session_state.older_exhausted:
+        cursor = st.session_state.older_cursor or tail
+        posts, cursor = fetch_posts_page(db, page_size, cursor)
+        st.session_state.older_posts.extend(posts)
+        st.session_state.older_cursor = cursor
+        st.session_state.older_exhausted = cursor is None
+
+def render_post(post_data, note=''):
+    st.markdown(f"**{post_data['Username']}** *{display_time(post_data)}{note}*")
+    st.text(post_data['Content'])
+    st.write("---")
+
+@st.experimental_fragment(run_every=5)
+def recent_posts():
+    # Borrowed on every run so a replaced client reaches the feed and writer
+    db = get_firestore()
+    # Every session reads the process-wide buffer; the listener keeps it current
+    feed = get_post_feed(db)
+    if not feed.wait_ready():
+        # Usually a failed stream, e.g. the composite index in firestore.indexes.json is not deployed
+        discard_post_feed(feed)
+        st.error('Could not load posts right now. Retrying...')
+        return
+    limit = st.session_state.feed_limit
+    posts = feed.recent(limit)
+    if len(posts) < limit and feed.is_full():
+        load_older_posts(db, feed, limit - len(posts))
+        shown = {post['id'] for post in posts}
+        posts += [post for post in st.session_state.older_posts if post['id'] not in shown][:limit - len(posts)]
+        has_more = not st.session_state.older_exhausted
+    else:
+        has_more = len(posts) == limit
+
+    # This session's own posts show straight away until the listener delivers them
+    writer = get_post_writer(db)
+    # Both long-lived holders are on the current client now, so replaced ones can go
+    close_retired(feed.db, writer.db)
+    delivered = {post['id'] for post in feed.recent()}
+    sending = []
+    for post_data in st.session_state.get('sent_posts', []):
+        if post_data['id'] in writer.failed:
+            st.error(f"Your post could not be saved: {post_data['Content'][:80]}")
+        elif post_data['id'] not in delivered:
+            sending.append(post_data)
+            render_post(post_data, note=' (sending...)')
+    st.session_state.sent_posts = sending
+
+    for post_data in posts:
+        render_post(post_data)
+
+    if has_more:
+        st.button('Load more', on_click=show_more_posts)
+    elif not posts:
+        st.info('No posts yet.')
+
 def chat_app():
     st.title("Professional Chat Page")
 
-    # Initialize Firestore
-    if 'db' not in st.session_state:
-        st.session_state.db = firestore.client()
-    db = st.session_state.db
+    # Borrow the process-wide Firestore client instead of opening one per session
+    db = get_firestore()
 
     # Welcome message
     st.subheader(f"Welcome, {st.session_state.user.email}!")
@@ -47,30 +119,28 @@ def chat_app():
 
     if st.button('Post'):
         if post.strip() != '':
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            data = {
-                "Username": st.session_state.user.email,
-                "Content": post,
-                "Timestamp": timestamp
-            }
-            db.collection('Posts').add(data)
-            st.success('Post uploaded!')
-            st.experimental_rerun()
+            data = new_post(st.session_state.user.email, post)
+            # Stored in the background; the post is shown optimistically meanwhile
+            try:
+                post_id = get_post_writer(db).submit(data)
+            except queue.Full:
+                st.warning('The chat is busy right now. Please try posting again in a moment.')
+            else:
+                st.session_state.setdefault('sent_posts', []).append({**data, 'id': post_id})
+                st.success('Post uploaded!')
         else:
             st.warning('Post cannot be empty.')
 
     st.write("---")
     st.header('Recent Posts')
 
-    # Fetch and display posts
-    posts = db.collection('Posts').order_by('Timestamp', direction=firestore.Query.DESCENDING).stream()
-    for post in posts:
-        post_data = post.to_dict()
-        st.markdown(f"**{post_data['Username']}** *{post_data['Timestamp']}*")
-        st.text(post_data['Content'])
-        st.write("---")
+    page_size = st.selectbox('Posts per page', [10, PAGE_SIZE, 50], index=1)
+    if st.session_state.get('feed_page_size') != page_size:
+        reset_feed(page_size)
+    recent_posts()
 
 def app():
+    get_app()
     if 'user' not in st.session_state:
         authenticate_user()
     else:
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+MODEL_PATH = os.environ.get("KERAS_MODEL_PATH", "FYP Stock Prediction Model.keras")
+# The bundled LSTM reads windows of 100 closing prices scaled to [0, 1]
+WINDOW = 100
+MAX_BATCH = 256
+MAX_WAIT = 0.01
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Load the Keras model once per process, on first use."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            import keras
+            _model = keras.saving.load_model(MODEL_PATH, compile=False)
+    return _model
+
+
+def _forward(batch):
+    return np.asarray(get_model()(batch, training=False)).reshape(len(batch))
+
+
+class MicroBatcher:
+    """Groups windows submitted by concurrent sessions into one forward pass.
+
+    A worker thread takes the first waiting request, collects whatever else
+    arrives within `max_wait` seconds (up to `max_batch` windows), runs them
+    through `predict_fn` together and hands each caller its own slice. A
+    request that finds the queue otherwise empty runs straight away, so a
+    lone session's step-by-step rollout never waits on `max_wait`.
+    """
+
+    def __init__(self, predict_fn, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, windows):
+        """Queue an array of shape (n, WINDOW, 1); the Future resolves to n predictions."""
+        future = Future()
+        self._queue.put((windows, future))
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="keras-batcher", daemon=True)
+                self._worker.start()
+        return future
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            size = len(items[0][0])
+            # Only linger for more windows when other requests are already waiting
+            deadline = time.monotonic() + (self.max_wait if not self._queue.empty() else 0)
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                items.append(item)
+                size += len(item[0])
+
+            try:
+                outputs = self.predict_fn(np.concatenate([windows for windows, _ in items]))
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            offset = 0
+            for windows, future in items:
+                future.set_result(outputs[offset:offset + len(windows)])
+                offset += len(windows)
+
+
+batcher = MicroBatcher(_forward)
+# Predictions keyed by ticker, the first and last bar dates and a hash of the prices
+prediction_cache = TTLCache(maxsize=1024, ttl=24 * 3600)
+
+
+def _scale(closes):
+    low, high = closes.min(), closes.max()
+    span = (high - low) or 1.0
+    return (closes - low) / span, low, span
+
+
+def _cache_entry(ticker, data):
+    # Prices are part of the key: a split re-adjusts history without changing its dates
+    fingerprint = hashlib.sha1(data['Adj Close'].to_numpy(dtype=float).tobytes()).hexdigest()
+    key = (ticker.upper(), data['Date'].iloc[0], data['Date'].iloc[-1], fingerprint)
+    entry = prediction_cache.get(key)
+    if entry is None:
+        entry = {'fitted': None, 'forecast': np.empty(0)}
+        prediction_cache.set(key, entry)
+    return entry
+
+
+def predict_history(ticker, data):
+    """Return one-step-ahead predictions for every bar after the first WINDOW."""
+    closes = data['Adj Close'].to_numpy(dtype=float)
+    if len(closes) <= WINDOW:
+        raise ValueError(f"The Keras engine needs more than {WINDOW} trading days of data")
+    entry = _cache_entry(ticker, data)
+    if entry['fitted'] is None:
+        scaled, low, span = _scale(closes)
+        windows = np.lib.stride_tricks.sliding_window_view(scaled[:-1], WINDOW)[..., np.newaxis]
+        # Submitted in MAX_BATCH chunks so other sessions' requests can share the passes
+        futures = [batcher.submit(windows[i:i + MAX_BATCH]) for i in range(0, len(windows), MAX_BATCH)]
+        predicted = np.concatenate([future.result() for future in futures])
+        entry['fitted'] = np.concatenate([np.full(WINDOW, np.nan), predicted * span + low])
+    return entry['fitted']
+
+
+def forecast(ticker, data, days):
+    """Roll the model forward `days` steps past the last bar."""
+    closes = data['Adj Close'].to_numpy(dtype=float)
+    if len(closes) < WINDOW:
+        raise ValueError(f"The Keras engine needs at least {WINDOW} trading days of data")
+    entry = _cache_entry(ticker, data)
+    # Forecasts are prefixes of each other, so a longer one extends the cached steps
+    if len(entry['forecast']) < days:
+        scaled, low, span = _scale(closes)
+        history = list(scaled[-WINDOW:]) + list((entry['forecast'] - low) / span)
+        steps = list(entry['forecast'])
+        while len(steps) < days:
+            window = np.asarray(history[-WINDOW:]).reshape(1, WINDOW, 1)
+            step = float(batcher.submit(window).result()[0])
+            history.append(step)
+            steps.append(step * span + low)
+        entry['forecast'] = np.asarray(steps)
+    return entry['forecast'][:days]
@@ -0,0 +1,30 @@
+import os
+
+import openai
+
+# Point the client at another OpenAI-compatible server, e.g. a local fake in tests
+API_BASE = os.environ.get("OPENAI_API_BASE")
+if API_BASE:
+    openai.api_base = API_BASE
+
+
+def complete_chat(messages, model):
+    response = openai.ChatCompletion.create(model=model, messages=messages)
+    return response.choices[0].message["content"]
+
+
+def stream_chat(messages, model, cancel_event=None):
+    """Yield the completion in chunks as the server sends them.
+
+    Stops reading, and closes the stream, as soon as `cancel_event` is set.
+    """
+    response = openai.ChatCompletion.create(model=model, messages=messages, stream=True)
+    try:
+        for chunk in response:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            content = chunk.choices[0].delta.get("content")
+            if content:
+                yield content
+    finally:
+        response.close()
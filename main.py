@@ -1,13 +1,7 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
-import firebase_admin
-from firebase_admin import credentials
 
-# Import your page modules
-import home
-import about
-import account
-import predict
+from page_loader import import_report, resolve
 
 # Set Streamlit page configuration
 st.set_page_config(
@@ -16,15 +10,6 @@ st.set_page_config(
     layout="wide",
 )
 
-# Initialize Firebase Admin SDK if not already initialized
-if not firebase_admin._apps:
-    try:
-        cred = credentials.Certificate(r"ramalsahamanda-ef9e255aa6e7.json")
-        firebase_admin.initialize_app(cred)
-        st.sidebar.success("Firebase initialized successfully")
-    except Exception as e:
-        st.sidebar.error(f"Failed to initialize Firebase: {e}")
-
 # Custom CSS for enhanced styling including background image
 st.markdown("""
     <style>
@@ -70,10 +55,12 @@ class MultiApp:
     def __init__(self):
         self.apps = []
 
-    def add_app(self, title, function):
+    def add_app(self, title, function, icon=None):
+        # function may be a callable or a "module:function" string imported on first selection
         self.apps.append({
             "title": title,
-            "function": function
+            "function": function,
+            "icon": icon
         })
 
     def run(self):
@@ -82,8 +69,8 @@ class MultiApp:
             st.sidebar.title("RamalSahamAnda")
             app = option_menu(
                 menu_title="Main Menu",
-                options=['E-learning', 'Stock Prediction', 'Sign Up', 'Chat'],
-                icons=['book', 'graph-up', 'person', 'chat'],
+                options=[entry["title"] for entry in self.apps],
+                icons=[entry["icon"] for entry in self.apps],
                 menu_icon='cast',
                 default_index=0,
                 orientation="vertical",
@@ -92,15 +79,23 @@ class MultiApp:
             st.sidebar.markdown("## Contact Us")
             st.sidebar.info("Email: A187996@siswa.ukm.edu.my")
 
-        if app == 'Chat':
-            home.app()
-        elif app == 'Sign Up':
-            account.app()
-        elif app == 'Stock Prediction':
-            predict.app()
-        elif app == 'E-learning':
-            about.app()
+        for entry in self.apps:
+            if entry["title"] == app:
+                page = resolve(entry["function"])
+                break
+
+        with st.sidebar.expander("Page import cost"):
+            for module, cost in import_report.items():
+                st.write(f"**{module}**: {cost['seconds']:.2f}s, {cost['modules']} modules")
+
+        page()
 
 # Create an instance of MultiApp and run it
+# Pages are imported only when first opened, so heavy libraries load on demand
 app_manager = MultiApp()
+app_manager.add_app('E-learning', 'about:app', icon='book')
+app_manager.add_app('Stock Prediction', 'predict:app', icon='graph-up')
+app_manager.add_app('Screener', 'screener:app', icon='funnel')
+app_manager.add_app('Sign Up', 'account:app', icon='person')
+app_manager.add_app('Chat', 'home:app', icon='chat')
 app_manager.run()
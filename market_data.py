@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import yfinance as yf
+
+import fundamentals
+from price_store import PriceStore
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+
+# Seconds each source may take before its section is given up on
+FETCH_TIMEOUTS = {
+    'prices': 30,
+    'info': 15,
+    'news': 20,
+    'balance_sheet': 20,
+    'income_statement': 20,
+    'cash_flow': 20,
+}
+DEFAULT_TIMEOUT = 20
+
+# Shared by every page and session in the process
+price_store = PriceStore()
+_news_store = None
+_news_store_lock = threading.Lock()
+ticker_info_cache = TTLCache(maxsize=512, ttl=15 * 60)
+fetch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fetch")
+# Concurrent sessions asking for the same ticker share one upstream call
+flights = SingleFlight()
+
+
+def get_price_history(ticker, start_date, end_date):
+    if not price_store.missing_ranges(ticker, start_date, end_date):
+        flights.hit('prices')
+        return price_store.load(ticker, start_date, end_date)
+    data = flights.do(('prices', ticker.upper(), str(start_date), str(end_date)),
+                      price_store.load, ticker, start_date, end_date)
+    # Callers that joined the flight share the frame, and pages edit it in place
+    return data.copy()
+
+
+def get_price_histories(tickers, start_date, end_date):
+    """Fetch many tickers on the shared pool; returns ({ticker: frame}, {ticker: error})."""
+    futures = {ticker: fetch_executor.submit(get_price_history, ticker, start_date, end_date) for ticker in tickers}
+    prices, errors = {}, {}
+    for ticker, future in futures.items():
+        try:
+            data = future.result()
+        except Exception as e:
+            errors[ticker] = e
+            continue
+        if data.empty:
+            errors[ticker] = ValueError("no price data")
+        else:
+            prices[ticker] = data
+    return prices, errors
+
+
+def get_ticker_info(ticker):
+    key = ticker.upper()
+    info = ticker_info_cache.get(key)
+    if info is not None:
+        flights.hit('info')
+        return info
+    info = flights.do(('info', key), lambda: yf.Ticker(ticker).info)
+    ticker_info_cache.set(key, info)
+    return info
+
+
+def is_known_ticker(ticker):
+    """True if `ticker` was fetched before, so it exists without asking upstream."""
+    return ticker.upper() in ticker_info_cache or bool(price_store.coverage(ticker))
+
+
+def get_news_store():
+    """Open the shared news store and start its refresher on first use.
+
+    Deferred so importers that never show news (the chatbot, the screener,
+    batch_runner's forked workers) neither create the SQLite database nor
+    inherit an open connection across fork().
+    """
+    global _news_store
+    with _news_store_lock:
+        if _news_store is None:
+            from news_store import NewsStore
+            _news_store = NewsStore()
+            _news_store.start_refresher()
+    return _news_store
+
+
+def get_news(ticker, n=10):
+    return flights.do(('news', ticker.upper(), n), get_news_store().top, ticker, n)
+
+
+def get_sentiment_history(ticker):
+    return get_news_store().daily_sentiment(ticker)
+
+
+def get_statement(ticker, statement):
+    """Fetch an annual statement ('balance_sheet', 'income_statement' or 'cash_flow')."""
+    return fundamentals.get_statement(ticker, statement)
+
+
+def submit_statement(ticker, statement):
+    """Like get_statement, but returns a Future instead of waiting for the rate limiter."""
+    return fundamentals.submit_statement(ticker, statement)
+
+
+def fetch_stats():
+    """Hit, miss and coalesced counts per source since the process started.
+
+    'fundamentals' counts statement requests that joined one already queued
+    for Alpha Vantage.
+    """
+    stats = flights.stats()
+    stats['fundamentals'] = {'coalesced': fundamentals.scheduler.coalesced,
+                             'queued': fundamentals.scheduler.queued()}
+    return stats
+
+
+def in_flight():
+    """Number of upstream calls currently running for the pages."""
+    return flights.in_flight()
+
+
+def start_fetches(sources):
+    """Submit every source at once; `sources` maps a name to (function, *args).
+
+    submit_statement already returns a Future and is called directly, so an
+    uncached statement waiting minutes for Alpha Vantage quota never holds a
+    pool thread that prices, info and news need.
+    """
+    return {
+        name: fn(*args) if fn is submit_statement else fetch_executor.submit(fn, *args)
+        for name, (fn, *args) in sources.items()
+    }
+
+
+def iter_resolved(futures, timeouts=FETCH_TIMEOUTS):
+    """Yield (name, result, error) for each future in the order they finish.
+
+    A source that outlives its own timeout is yielded with a TimeoutError
+    so the caller can give up on that section without waiting for it.
+    """
+    started = time.monotonic()
+    deadlines = {name: started + timeouts.get(name, DEFAULT_TIMEOUT) for name in futures}
+    pending = {future: name for name, future in futures.items()}
+    while pending:
+        now = time.monotonic()
+        for future, name in list(pending.items()):
+            if not future.done() and deadlines[name] <= now:
+                del pending[future]
+                yield name, None, TimeoutError(f"{name} took longer than {timeouts.get(name, DEFAULT_TIMEOUT)}s")
+        if not pending:
+            break
+        next_deadline = min(deadlines[name] for name in pending.values())
+        done, _ = wait(pending, timeout=max(next_deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            error = future.exception()
+            yield name, None if error else future.result(), error
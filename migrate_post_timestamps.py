@@ -0,0 +1,65 @@
+"""Backfill CreatedAt/Seq on Posts written before they were introduced.
+
+The feed orders by (CreatedAt, Seq), and Firestore leaves documents without
+those fields out of such queries, so run this once after deploying:
+
+    python migrate_post_timestamps.py --dry-run
+    python migrate_post_timestamps.py
+
+CreatedAt is taken from each document's server-side create_time. Seq is
+derived from the same instant plus a per-document offset below one second,
+which gives old posts from the same second a stable order.
+"""
+import argparse
+import zlib
+
+from firebase_client import CREDENTIALS_PATH, get_app, get_firestore
+from posts import POSTS
+
+BATCH_SIZE = 500
+
+
+def legacy_seq(doc):
+    seconds = int(doc.create_time.timestamp())
+    return seconds * 1_000_000_000 + zlib.crc32(doc.id.encode()) % 1_000_000_000
+
+
+def migrate(db, batch_size=BATCH_SIZE, dry_run=False):
+    """Page through Posts by document id and update the ones missing CreatedAt."""
+    scanned = updated = 0
+    cursor = None
+    while True:
+        query = db.collection(POSTS).order_by('__name__').limit(batch_size)
+        if cursor is not None:
+            query = query.start_after(cursor)
+        docs = list(query.stream())
+        if not docs:
+            break
+        batch = db.batch()
+        pending = 0
+        for doc in docs:
+            if 'CreatedAt' not in doc.to_dict():
+                batch.update(doc.reference, {'CreatedAt': doc.create_time, 'Seq': legacy_seq(doc)})
+                pending += 1
+        if pending and not dry_run:
+            batch.commit()
+        scanned += len(docs)
+        updated += pending
+        cursor = docs[-1]
+        print(f"scanned {scanned}, {'would update' if dry_run else 'updated'} {updated}")
+    return scanned, updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--credentials', default=CREDENTIALS_PATH)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    get_app(args.credentials)
+    migrate(get_firestore(check=False), args.batch_size, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
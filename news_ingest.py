@@ -0,0 +1,68 @@
+"""Ingest news for a whole watchlist and update per-ticker daily sentiment.
+
+    python news_ingest.py AAPL MSFT NVDA --tickers-file watchlist.txt
+
+Feeds are fetched concurrently on threads. Headlines and summaries that are
+new to the store are scored on a process pool in batches. The results land
+in the shared news store that the Top 10 News tab reads.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from news_store import NewsStore, fetch_feed, sentiment_scores
+
+SCORE_BATCH = 256
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def ingest(tickers, store=None, fetch_workers=16, score_workers=None, batch_size=SCORE_BATCH):
+    """Fetch, score and store news for every ticker; returns {ticker: new articles}."""
+    store = store or NewsStore()
+    tickers = [ticker.upper() for ticker in tickers]
+    with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+        feeds = dict(zip(tickers, pool.map(fetch_feed, tickers)))
+
+    # The same story often appears in several feeds; score each one once
+    unique = {}
+    for articles in feeds.values():
+        for article in store.unseen(articles):
+            unique.setdefault(article['key'], article)
+    articles = list(unique.values())
+    texts = [a['title'] for a in articles] + [a['summary'] for a in articles]
+    if texts:
+        with ProcessPoolExecutor(max_workers=score_workers) as pool:
+            scores = [score for batch in pool.map(sentiment_scores, _chunks(texts, batch_size)) for score in batch]
+        for article, title_score, summary_score in zip(articles, scores[:len(articles)], scores[len(articles):]):
+            article['score_title'] = title_score
+            article['score_summary'] = summary_score
+
+    added = {}
+    for ticker, ticker_articles in feeds.items():
+        scored = [unique.get(article['key'], article) for article in ticker_articles]
+        added[ticker] = store.add_articles(ticker, scored)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('tickers', nargs='*', help='ticker symbols')
+    parser.add_argument('--tickers-file', help='file with one ticker per line')
+    parser.add_argument('--workers', type=int, help='scoring processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not tickers:
+        parser.error('no tickers given')
+
+    for ticker, count in ingest(list(dict.fromkeys(tickers)), score_workers=args.workers).items():
+        print(f"{ticker}: {count} new articles")
+
+
+if __name__ == '__main__':
+    main()
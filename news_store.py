@@ -0,0 +1,212 @@
+import calendar
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import feedparser
+import pandas as pd
+
+DB_PATH = os.environ.get("NEWS_DB_PATH", ".news/news.sqlite3")
+FEED_URL = "https://feeds.finance.yahoo.com/rss/2.0/headline?s={}&region=US&lang=en-US"
+REFRESH_INTERVAL = 15 * 60
+# Tickers viewed within this window are kept fresh by the background refresher
+ACTIVE_WINDOW = 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    title TEXT,
+    summary TEXT,
+    link TEXT,
+    published TEXT,
+    published_ts REAL,
+    score_title REAL,
+    score_summary REAL
+);
+CREATE TABLE IF NOT EXISTS ticker_articles (
+    ticker TEXT,
+    key TEXT,
+    published_ts REAL,
+    PRIMARY KEY (ticker, key)
+);
+CREATE INDEX IF NOT EXISTS ticker_articles_recent ON ticker_articles (ticker, published_ts DESC);
+CREATE TABLE IF NOT EXISTS feeds (
+    ticker TEXT PRIMARY KEY,
+    refreshed_at REAL
+);
+CREATE TABLE IF NOT EXISTS sentiment_daily (
+    ticker TEXT,
+    day TEXT,
+    articles INTEGER,
+    mean_title REAL,
+    mean_summary REAL,
+    PRIMARY KEY (ticker, day)
+);
+"""
+
+DAILY_SENTIMENT_SQL = """
+INSERT OR REPLACE INTO sentiment_daily
+SELECT t.ticker, date(t.published_ts, 'unixepoch'), count(*), avg(a.score_title), avg(a.score_summary)
+FROM ticker_articles t JOIN articles a ON a.key = t.key
+WHERE t.ticker = ?
+GROUP BY t.ticker, date(t.published_ts, 'unixepoch')
+"""
+
+_analyzer = None
+
+
+def sentiment_scores(texts):
+    """VADER compound scores, loading the lexicon on first use."""
+    global _analyzer
+    if _analyzer is None:
+        import nltk
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        try:
+            _analyzer = SentimentIntensityAnalyzer()
+        except LookupError:
+            nltk.download('vader_lexicon', quiet=True)
+            _analyzer = SentimentIntensityAnalyzer()
+    return [_analyzer.polarity_scores(text or '')['compound'] for text in texts]
+
+
+def sentiment_label(score):
+    if score >= 0.05:
+        return 'Positive'
+    if score <= -0.05:
+        return 'Negative'
+    return 'Neutral'
+
+
+def article_key(entry):
+    ident = entry.get('link') or entry.get('id') or entry.get('title', '')
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+
+def fetch_feed(ticker):
+    """Parse the ticker's RSS feed into article dicts (without sentiment)."""
+    articles = []
+    for entry in feedparser.parse(FEED_URL.format(ticker)).entries:
+        published_parsed = entry.get('published_parsed')
+        articles.append({
+            'key': article_key(entry),
+            'title': entry.get('title', ''),
+            'summary': entry.get('summary', ''),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', ''),
+            'published_ts': calendar.timegm(published_parsed) if published_parsed else time.time(),
+        })
+    return articles
+
+
+class NewsStore:
+    """Persistent article store that scores each article's sentiment once.
+
+    Articles are keyed by a hash of their link, so a headline carried by
+    several tickers' feeds, or seen again on the next refresh, is never
+    re-scored. Reads are served from an index on (ticker, published time).
+    """
+
+    def __init__(self, path=DB_PATH, fetch=fetch_feed, score=sentiment_scores):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.fetch = fetch
+        self.score = score
+        self.scored = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._viewed = {}
+        self._refresher = None
+
+    def refreshed_at(self, ticker):
+        with self._lock:
+            row = self._db.execute("SELECT refreshed_at FROM feeds WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    def add_articles(self, ticker, articles):
+        """Store a feed's articles for a ticker, scoring only ones not seen before.
+
+        Articles that already carry 'score_title'/'score_summary' (scored in
+        bulk by news_ingest) are stored as they are.
+        """
+        new = self.unseen(articles)
+        unscored = [article for article in new if 'score_title' not in article]
+        if unscored:
+            scores = self.score([a['title'] for a in unscored] + [a['summary'] for a in unscored])
+            for article, title_score, summary_score in zip(unscored, scores[:len(unscored)], scores[len(unscored):]):
+                article['score_title'] = title_score
+                article['score_summary'] = summary_score
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO articles VALUES "
+                "(:key, :title, :summary, :link, :published, :published_ts, :score_title, :score_summary)", new)
+            self._db.executemany(
+                "INSERT OR IGNORE INTO ticker_articles VALUES (?, ?, ?)",
+                [(ticker, a['key'], a['published_ts']) for a in articles])
+            self._db.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?)", (ticker, time.time()))
+            self._db.execute(DAILY_SENTIMENT_SQL, (ticker,))
+        self.scored += len(new)
+        return len(new)
+
+    def unseen(self, articles):
+        """The articles whose key is not in the store yet."""
+        keys = [article['key'] for article in articles]
+        with self._lock:
+            known = {row[0] for row in self._db.execute(
+                f"SELECT key FROM articles WHERE key IN ({','.join('?' * len(keys))})", keys)}
+        return [article for article in articles if article['key'] not in known]
+
+    def refresh(self, ticker, max_age=REFRESH_INTERVAL):
+        """Fetch the ticker's feed if it is older than `max_age`; returns new article count."""
+        ticker = ticker.upper()
+        refreshed_at = self.refreshed_at(ticker)
+        if refreshed_at is not None and time.time() - refreshed_at < max_age:
+            return 0
+        return self.add_articles(ticker, self.fetch(ticker))
+
+    def top(self, ticker, n=10):
+        """Newest `n` articles in the same shape as StockNews.read_rss()."""
+        ticker = ticker.upper()
+        self._viewed[ticker] = time.time()
+        self.refresh(ticker)
+        with self._lock:
+            data = pd.read_sql_query(
+                "SELECT a.title, a.summary, a.link, a.published, a.score_title, a.score_summary "
+                "FROM ticker_articles t JOIN articles a ON a.key = t.key "
+                "WHERE t.ticker = ? ORDER BY t.published_ts DESC LIMIT ?",
+                self._db, params=(ticker, n))
+        data['sentiment_title'] = data['score_title'].map(sentiment_label)
+        data['sentiment_summary'] = data['score_summary'].map(sentiment_label)
+        return data
+
+    def daily_sentiment(self, ticker):
+        """Per-day article count and mean title/summary sentiment for a ticker."""
+        with self._lock:
+            data = pd.read_sql_query(
+                "SELECT day, articles, mean_title, mean_summary FROM sentiment_daily "
+                "WHERE ticker = ? ORDER BY day", self._db, params=(ticker.upper(),))
+        data['day'] = pd.to_datetime(data['day'])
+        return data
+
+    def start_refresher(self, interval=REFRESH_INTERVAL):
+        """Keep recently viewed tickers fresh from a background thread."""
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                               name="news-refresher", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            now = time.time()
+            for ticker, viewed_at in list(self._viewed.items()):
+                if now - viewed_at > ACTIVE_WINDOW:
+                    self._viewed.pop(ticker, None)
+                    continue
+                try:
+                    # Slightly early, so readers rarely find the feed stale
+                    self.refresh(ticker, max_age=interval * 0.9)
+                except Exception:
+                    pass
@@ -0,0 +1,30 @@
+import importlib
+import sys
+import threading
+import time
+
+# Cost of resolving each lazily imported page, kept for the life of the process
+import_report = {}
+_lock = threading.Lock()
+
+
+def resolve(entry):
+    """Return the callable for a page entry point.
+
+    Entries are either callables or "module:function" strings; strings are
+    imported on first use and the time and number of modules the import
+    pulled in are recorded in `import_report`.
+    """
+    if callable(entry):
+        return entry
+    module_name, _, attr = entry.partition(':')
+    with _lock:
+        if module_name not in sys.modules:
+            loaded_before = len(sys.modules)
+            started = time.perf_counter()
+            importlib.import_module(module_name)
+            import_report[module_name] = {
+                'seconds': time.perf_counter() - started,
+                'modules': len(sys.modules) - loaded_before,
+            }
+    return getattr(sys.modules[module_name], attr or 'app')
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+import pypdfium2 as pdfium
+
+CACHE_DIR = os.environ.get("PDF_CACHE_DIR", ".pdf_cache")
+PAGE_WIDTH = 900
+THUMBNAIL_WIDTH = 160
+
+# pdfium is not thread-safe, so every render in the process goes through one lock
+_render_lock = threading.Lock()
+_prerendering = set()
+_versions = {}
+_contents = {}
+
+
+def file_version(path):
+    """Short content hash, used for cache directories and cache-busting URLs."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _versions:
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _versions[key] = digest.hexdigest()[:12]
+    return _versions[key]
+
+
+def file_bytes(path):
+    """Contents of the file, read once per version and kept for download buttons."""
+    version = file_version(path)
+    if _contents.get(path, (None,))[0] != version:
+        with open(path, 'rb') as f:
+            _contents[path] = (version, f.read())
+    return _contents[path][1]
+
+
+def _cache_dir(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-{file_version(path)}")
+
+
+def page_count(path):
+    with _render_lock:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def page_image(path, index, width=PAGE_WIDTH):
+    """Return the path of a PNG of one page, rendering it on first request."""
+    target = os.path.join(_cache_dir(path), f"page-{index}-{width}.png")
+    if os.path.exists(target):
+        return target
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with _render_lock:
+        # Another thread (e.g. the thumbnail prerender) may have finished it meanwhile
+        if os.path.exists(target):
+            return target
+        pdf = pdfium.PdfDocument(path)
+        try:
+            page = pdf[index]
+            image = page.render(scale=width / page.get_width()).to_pil()
+        finally:
+            pdf.close()
+    # A temp file per writer, so concurrent renders never replace each other's half-written file
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(target), suffix=".png", delete=False) as f:
+        image.save(f, format='PNG')
+    os.replace(f.name, target)
+    return target
+
+
+def thumbnail(path, index):
+    return page_image(path, index, THUMBNAIL_WIDTH)
+
+
+def prerender_thumbnails(path):
+    """Render every thumbnail in a background thread, once per file per process."""
+    if path in _prerendering:
+        return
+    _prerendering.add(path)
+
+    def run():
+        for index in range(page_count(path)):
+            thumbnail(path, index)
+
+    threading.Thread(target=run, name="pdf-thumbnails", daemon=True).start()
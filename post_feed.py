@@ -0,0 +1,105 @@
+import threading
+import time
+
+from posts import POSTS, newest_first
+
+BUFFER_SIZE = 200
+
+
+class PostFeed:
+    """Process-wide window of the newest posts, kept current by one listener.
+
+    The listener watches the newest `size` posts. Firestore sends only the
+    changes to that window after the first snapshot, and each change is
+    applied at its reported index, so the buffer stays ordered. When new
+    posts arrive, the oldest ones drop out of the window as removals. Every
+    session reads from this buffer instead of querying Firestore itself.
+    """
+
+    def __init__(self, db, size=BUFFER_SIZE):
+        self.db = db
+        self.size = size
+        self.version = 0
+        self._docs = []
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch = None
+
+    def start(self):
+        query = newest_first(self.db.collection(POSTS)).limit(self.size)
+        self._watch = query.on_snapshot(self._on_snapshot)
+        return self
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, snapshot, changes, read_time):
+        with self._lock:
+            # Indexes are relative to the result of the previous change, so apply in order
+            for change in changes:
+                if change.old_index != -1:
+                    del self._docs[change.old_index]
+                if change.new_index != -1:
+                    self._docs.insert(change.new_index, change.document)
+            self.version += 1
+        self._ready.set()
+
+    def is_alive(self):
+        """False once the listener has stopped, e.g. after a stream error."""
+        return self._watch is not None and getattr(self._watch, 'is_active', True)
+
+    def wait_ready(self, timeout=10):
+        """Wait for the first snapshot; returns False on timeout or if the listener dies."""
+        deadline = time.monotonic() + timeout
+        while not self._ready.wait(0.1):
+            if not self.is_alive() or time.monotonic() >= deadline:
+                return False
+        return True
+
+    def is_full(self):
+        with self._lock:
+            return len(self._docs) >= self.size
+
+    def recent(self, limit=None):
+        """Return up to `limit` newest posts as dicts (with their document id)."""
+        with self._lock:
+            docs = self._docs[:limit]
+        return [{**doc.to_dict(), 'id': doc.id} for doc in docs]
+
+    def oldest_snapshot(self):
+        """Snapshot to continue from with a cursor query past the buffer."""
+        with self._lock:
+            return self._docs[-1] if self._docs else None
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_post_feed(db):
+    """Return the shared feed, starting its listener on first use.
+
+    If `db` is a different client from the one the feed listens on (the
+    shared client was replaced after a failed health check), the old
+    listener is stopped and a new one is started on `db`. A listener that
+    has died is replaced the same way.
+    """
+    global _feed
+    with _feed_lock:
+        if _feed is not None and (_feed.db is not db or not _feed.is_alive()):
+            _feed.stop()
+            _feed = None
+        if _feed is None:
+            _feed = PostFeed(db).start()
+    return _feed
+
+
+def discard_post_feed(feed):
+    """Drop `feed` so the next get_post_feed starts a fresh listener."""
+    global _feed
+    with _feed_lock:
+        if _feed is feed:
+            feed.stop()
+            _feed = None
@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+
+from posts import POSTS
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.25
+MAX_PENDING = 1000
+MAX_RETRIES = 5
+
+
+class PostWriter:
+    """Write-behind queue that commits posts to Firestore in batches.
+
+    `submit` assigns the document id up front and returns straight away, so
+    the page can show the post before it is stored. A worker thread groups
+    whatever is queued within `flush_interval` into one batched write and
+    retries with backoff. Retries use `set` on the pre-assigned ids, so they
+    cannot duplicate posts. When `max_pending` posts are waiting, `submit`
+    raises queue.Full instead of letting the backlog grow.
+    """
+
+    def __init__(self, db, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_pending=MAX_PENDING, max_retries=MAX_RETRIES):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.written = 0
+        self.batches = 0
+        self.failed = set()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, data, timeout=1):
+        """Queue a post and return its document id; raises queue.Full under backpressure."""
+        ref = self.db.collection(POSTS).document()
+        self._queue.put((ref, data), timeout=timeout)
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="post-writer", daemon=True)
+                self._worker.start()
+        return ref.id
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(items)
+
+    def _commit(self, items):
+        for attempt in range(self.max_retries):
+            batch = self.db.batch()
+            for ref, data in items:
+                # Rebind to the current client in case it was replaced since submit
+                batch.set(self.db.document(ref.path), data)
+            try:
+                batch.commit()
+            except Exception:
+                time.sleep(min(0.5 * 2 ** attempt, 10))
+                continue
+            self.written += len(items)
+            self.batches += 1
+            return
+        with self._lock:
+            self.failed.update(ref.id for ref, _ in items)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_post_writer(db):
+    """Return the shared writer, moving it onto `db` if the client was replaced."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PostWriter(db)
+        elif _writer.db is not db:
+            _writer.db = db
+    return _writer
@@ -0,0 +1,70 @@
+import threading
+import time
+from datetime import datetime
+
+from firebase_admin import firestore
+
+POSTS = 'Posts'
+PAGE_SIZE = 20
+
+# Posts are ordered by server commit time, then by a per-post sequence that
+# breaks ties between posts committed in the same batch. Queries on this key
+# are served by the composite index in firestore.indexes.json.
+ORDER_FIELDS = ('CreatedAt', 'Seq')
+
+_seq_lock = threading.Lock()
+_last_seq = 0
+
+
+def next_seq():
+    """Strictly increasing within the process, close to wall-clock nanoseconds."""
+    global _last_seq
+    with _seq_lock:
+        _last_seq = max(_last_seq + 1, time.time_ns())
+        return _last_seq
+
+
+def new_post(username, content):
+    return {
+        "Username": username,
+        "Content": content,
+        # Display string, kept for older readers
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "CreatedAt": firestore.SERVER_TIMESTAMP,
+        "Seq": next_seq(),
+    }
+
+
+def display_time(post):
+    """Commit time shown for a post, matching the order the feed uses."""
+    created_at = post.get('CreatedAt')
+    if isinstance(created_at, datetime):
+        return created_at.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    # Not committed yet (still the SERVER_TIMESTAMP sentinel)
+    return post.get('Timestamp', '')
+
+
+def newest_first(query):
+    for field in ORDER_FIELDS:
+        query = query.order_by(field, direction=firestore.Query.DESCENDING)
+    return query
+
+
+def _page(query, page_size):
+    docs = list(query.limit(page_size).stream())
+    cursor = docs[-1] if len(docs) == page_size else None
+    return [{**doc.to_dict(), 'id': doc.id} for doc in docs], cursor
+
+
+def fetch_posts_page(db, page_size=PAGE_SIZE, start_after=None):
+    """Return (posts, cursor) for one page of posts, newest first.
+
+    `cursor` is the last document snapshot of the page, to pass back as
+    `start_after` for the next page, or None once the collection is exhausted.
+    Works with any client exposing the Firestore query API, including the
+    emulator or an in-memory fake.
+    """
+    query = newest_first(db.collection(POSTS))
+    if start_after is not None:
+        query = query.start_after(start_after)
+    return _page(query, page_size)
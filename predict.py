@@ -1,15 +1,47 @@
+from itertools import chain
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import yfinance as yf
 import plotly.express as px
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from stocknews import StockNews
-from alpha_vantage.fundamentaldata import FundamentalData
+from charts import line_chart, paged_table
+from market_data import (
+    fetch_stats,
+    get_news,
+    get_price_history,
+    get_sentiment_history,
+    get_ticker_info,
+    in_flight,
+    iter_resolved,
+    start_fetches,
+    submit_statement,
+)
+from analytics import (
+    add_daily_change,
+    future_dates,
+    keras_forecast,
+    linear_forecast,
+    pricing_metrics,
+)
+
+STATEMENT_TITLES = {
+    'balance_sheet': 'Balance Sheet',
+    'income_statement': 'Income Statement',
+    'cash_flow': 'Cash Flow Statement',
+}
+
+TABS = ["Pricing Data", "Fundamental Data", "Top 10 News", "Prediction"]
+
+# Sources each part of the page needs; the header is always shown
+HEADER_SOURCES = ('info', 'prices')
+TAB_SOURCES = {
+    "Pricing Data": ('prices',),
+    "Fundamental Data": tuple(STATEMENT_TITLES),
+    "Top 10 News": ('news',),
+    "Prediction": ('prices',),
+}
 
 def get_stock_market(ticker):
-    ticker_info = yf.Ticker(ticker).info
+    ticker_info = get_ticker_info(ticker)
     if 'exchange' in ticker_info:
         exchange = ticker_info['exchange']
         if exchange == 'NMS':
@@ -21,6 +53,107 @@ def get_stock_market(ticker):
     else:
         return "Unknown"
 
+def render_header(ticker, stock_info):
+    st.header(f"**{stock_info['shortName']} ({ticker})**")
+    st.write(f"**Exchange:** {get_stock_market(ticker)}")
+    st.write(f"**Current Price:** ${stock_info['currentPrice']:.2f}")
+    st.write(f"**Market Cap:** ${stock_info['marketCap']:,}")
+    st.write(f"**P/E Ratio:** {stock_info['trailingPE']:.2f}")
+    st.write(f"**Dividend Yield:** {stock_info['dividendYield']:.2%}")
+
+def render_price_chart(ticker, data):
+    line_chart(data, None, 'Adj Close', key='price_zoom', title=f'{ticker} Adjusted Close Price')
+
+def render_sentiment_history(ticker):
+    sentiment = get_sentiment_history(ticker).rename(columns={'mean_title': 'Title Sentiment', 'mean_summary': 'News Sentiment'})
+    if len(sentiment) > 1:
+        fig = px.line(sentiment, x='day', y=['Title Sentiment', 'News Sentiment'], labels={'value': 'Mean Sentiment (-1 to 1)', 'variable': 'Legend', 'day': 'Date'}, title=f'{ticker} Daily News Sentiment')
+        st.plotly_chart(fig, use_container_width=True)
+
+def render_news(ticker, df_news):
+    st.subheader(f'Top 10 News for {ticker}')
+    render_sentiment_history(ticker)
+    for i in range(min(10, len(df_news))):
+        st.markdown(f"### News {i + 1}: {df_news['title'][i]}")
+        st.markdown(f"**Published on:** {df_news['published'][i]}")
+        st.markdown(f"**Summary:** {df_news['summary'][i]}")
+        title_sentiment = df_news['sentiment_title'][i]
+        news_sentiment = df_news['sentiment_summary'][i]
+
+        sentiment_colors = {
+            'Positive': 'green',
+            'Neutral': 'gray',
+            'Negative': 'red'
+        }
+
+        title_color = sentiment_colors.get(title_sentiment, 'black')
+        news_color = sentiment_colors.get(news_sentiment, 'black')
+
+        st.markdown(f"**Title Sentiment:** <span style='color:{title_color}'>{title_sentiment}</span>", unsafe_allow_html=True)
+        st.markdown(f"**News Sentiment:** <span style='color:{news_color}'>{news_sentiment}</span>", unsafe_allow_html=True)
+        st.markdown('---')
+
+def render_pricing(data):
+    st.subheader('Pricing Data')
+    paged_table(data, key='pricing_table')
+
+    metrics = pricing_metrics(data)
+    annual_return = metrics['Annual Return']
+    stdev = metrics['Standard Deviation']
+
+    col7, col8 ,col9 = st.columns([1,1,1])
+
+    with col7:
+        st.metric("Annual Return", f"{annual_return:.2f}%")
+
+    with col8:
+        st.metric("Standard Deviation", f"{stdev:.2%}")
+
+    with col9:
+        st.metric("Risk Adjusted Return", f"{metrics['Risk Adjusted Return']:.2f}")
+
+def render_statement(statement, raw):
+    st.subheader(STATEMENT_TITLES[statement])
+    table = raw.T[2:]
+    table.columns = list(raw.T.iloc[0])
+    paged_table(table, key=statement)
+
+def render_prediction(ticker, data):
+    st.subheader(f'{ticker} Stock Price Prediction')
+    engine = st.radio('Prediction Engine', list(PREDICTION_ENGINES), horizontal=True, key='prediction_engine')
+    try:
+        data, predict_future = PREDICTION_ENGINES[engine](ticker, data)
+    except ImportError:
+        st.warning("The LSTM engine needs TensorFlow/Keras installed on the server.")
+        return
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    # Plot the actual and predicted prices
+    line_chart(data, 'Date', ['Adj Close', 'Predicted'], key='prediction_zoom', labels={'value': 'Price', 'variable': 'Legend'}, title=f'{ticker} Stock Price Prediction')
+
+    # Future predictions
+    days_to_predict = st.slider('Days to Predict', 1, 365, 30)
+    future_predictions = predict_future(days_to_predict)
+
+    # Create a dataframe for future predictions
+    future_data = pd.DataFrame({'Date': future_dates(data, days_to_predict), 'Predicted': future_predictions})
+
+    # Plot future predictions
+    line_chart(future_data, 'Date', 'Predicted', key='future_zoom', labels={'Predicted': 'Price'}, title=f'{ticker} Future Stock Price Prediction')
+
+def render_fetch_stats():
+    with st.sidebar.expander("Data fetch stats"):
+        for source, counts in fetch_stats().items():
+            st.write(f"**{source}**: " + ", ".join(f"{count} {outcome}" for outcome, count in counts.items()))
+        st.write(f"**In flight**: {in_flight()}")
+
+PREDICTION_ENGINES = {
+    'Linear Regression': linear_forecast,
+    'LSTM (Keras)': keras_forecast,
+}
+
 def app():
     # Page title
     st.title('📈 Stock Market / Investment Dashboard')
@@ -47,22 +180,19 @@ def app():
     with col6:
         end_date = st.date_input('End Date', pd.to_datetime('today'))
 
-    # Fetch data from Yahoo Finance
-    data = yf.download(ticker, start=start_date, end=end_date)
-    stock = yf.Ticker(ticker)
-    stock_info = stock.info
+    # Results are memoized per session for the current ticker and date range
+    query = (ticker.upper(), start_date, end_date)
+    if st.session_state.get('tab_memo_query') != query:
+        st.session_state.tab_memo_query = query
+        st.session_state.tab_memo = {}
+    memo = st.session_state.tab_memo
 
-    # Display market information at the top
-    st.header(f"**{stock_info['shortName']} ({ticker})**")
-    st.write(f"**Exchange:** {get_stock_market(ticker)}")
-    st.write(f"**Current Price:** ${stock_info['currentPrice']:.2f}")
-    st.write(f"**Market Cap:** ${stock_info['marketCap']:,}")
-    st.write(f"**P/E Ratio:** {stock_info['trailingPE']:.2f}")
-    st.write(f"**Dividend Yield:** {stock_info['dividendYield']:.2%}")
+    lazy_tabs = st.toggle('Load tabs only when opened', value=True,
+                          help='Fetch and compute only the tab you are viewing. Turn off to load every tab at once.')
 
-    # Plot stock price data
-    fig = px.line(data, x=data.index, y='Adj Close', title=f'{ticker} Adjusted Close Price')
-    st.plotly_chart(fig, use_container_width=True)
+    # Lay out every section up front and fill each one as its source resolves
+    header = st.container()
+    price_chart = st.container()
     st.markdown("---")
 
     # Tips for beginners
@@ -75,114 +205,71 @@ def app():
     """)
 
     # Create tabs for different types of data
-    pricing_data, fundamental_data, news, prediction = st.tabs(["Pricing Data", "Fundamental Data", "Top 10 News", "Prediction"])
-
-    # News Tab
-    with news:
-        st.subheader(f'Top 10 News for {ticker}')
-        sn = StockNews(ticker, save_news=False)
-        df_news = sn.read_rss()
-        
-        for i in range(10):
-            st.markdown(f"### News {i + 1}: {df_news['title'][i]}")
-            st.markdown(f"**Published on:** {df_news['published'][i]}")
-            st.markdown(f"**Summary:** {df_news['summary'][i]}")
-            title_sentiment = df_news['sentiment_title'][i]
-            news_sentiment = df_news['sentiment_summary'][i]
-            
-            sentiment_colors = {
-                'Positive': 'green',
-                'Neutral': 'gray',
-                'Negative': 'red'
-            }
-            
-            title_color = sentiment_colors.get(title_sentiment, 'black')
-            news_color = sentiment_colors.get(news_sentiment, 'black')
-            
-            st.markdown(f"**Title Sentiment:** <span style='color:{title_color}'>{title_sentiment}</span>", unsafe_allow_html=True)
-            st.markdown(f"**News Sentiment:** <span style='color:{news_color}'>{news_sentiment}</span>", unsafe_allow_html=True)
-            st.markdown('---')
-
-    # Pricing Data Tab
-    with pricing_data:
-        st.subheader('Pricing Data')
-        data['% Change'] = data['Adj Close'].pct_change()
-        data.dropna(inplace=True)
-        st.write(data)
-        
-        annual_return = data['% Change'].mean() * 252 * 100
-        stdev = data['% Change'].std() * np.sqrt(252)
-
-        col7, col8 ,col9 = st.columns([1,1,1])
-        
-        with col7:
-            st.metric("Annual Return", f"{annual_return:.2f}%")
-
-        with col8:
-            st.metric("Standard Deviation", f"{stdev:.2f}%")
-
-        with col9:
-            st.metric("Risk Adjusted Return", f"{annual_return/stdev:.2f}")
-
-    # Fundamental Data Tab
-    with fundamental_data:
-        key = '1VZ9G6S9P6TTKQLF'
-        fd = FundamentalData(key, output_format='pandas')
-        st.subheader('Balance Sheet')
-        balance_sheet = fd.get_balance_sheet_annual(ticker)[0]
-        bs = balance_sheet.T[2:]
-        bs.columns = list(balance_sheet.T.iloc[0])
-        st.write(bs)
-        st.subheader('Income Statement')
-        income_statement = fd.get_income_statement_annual(ticker)[0]
-        is1 = income_statement.T[2:]
-        is1.columns = list(income_statement.T.iloc[0])
-        st.write(is1)
-        st.subheader('Cash Flow Statement')
-        cash_flow = fd.get_cash_flow_annual(ticker)[0]
-        cf = cash_flow.T[2:]
-        cf.columns = list(cash_flow.T.iloc[0])
-        st.write(cf)
-
-    # Prediction Tab
-    with prediction:
-        st.subheader(f'{ticker} Stock Price Prediction')
-
-        # Prepare the data for prediction
-        data['Date'] = data.index
-        data.reset_index(drop=True, inplace=True)
-        data['Days'] = (data['Date'] - data['Date'].min()).dt.days
-
-        # Select features and target
-        X = data[['Days']]
-        y = data['Adj Close']
-
-        # Split the data into training and testing sets
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
-
-        # Create and train the model
-        model = LinearRegression()
-        model.fit(X_train, y_train)
-
-        # Make predictions
-        data['Predicted'] = model.predict(X)
-
-        # Plot the actual and predicted prices
-        fig_pred = px.line(data, x='Date', y=['Adj Close', 'Predicted'], labels={'value': 'Price', 'variable': 'Legend'}, title=f'{ticker} Stock Price Prediction')
-        st.plotly_chart(fig_pred, use_container_width=True)
-
-        # Future predictions
-        days_to_predict = st.slider('Days to Predict', 1, 365, 30)
-        future_days = pd.DataFrame({'Days': np.arange(data['Days'].max() + 1, data['Days'].max() + 1 + days_to_predict)})
-        future_dates = pd.date_range(start=data['Date'].max() + pd.Timedelta(days=1), periods=days_to_predict, freq='D')
-        future_predictions = model.predict(future_days)
-
-        # Create a dataframe for future predictions
-        future_data = pd.DataFrame({'Date': future_dates, 'Predicted': future_predictions})
-        
-        # Plot future predictions
-        fig_future_pred = px.line(future_data, x='Date', y='Predicted', labels={'Predicted': 'Price'}, title=f'{ticker} Future Stock Price Prediction')
-        st.plotly_chart(fig_future_pred, use_container_width=True)
+    if lazy_tabs:
+        # st.tabs runs every tab body, so lazy mode only builds the selected one
+        active_tab = st.radio('Section', TABS, horizontal=True, label_visibility='collapsed', key='active_tab')
+        tabs = {tab: st.container() if tab == active_tab else None for tab in TABS}
+    else:
+        tabs = dict(zip(TABS, st.tabs(TABS)))
+    pricing_data, fundamental_data, news, prediction = (tabs[tab] for tab in TABS)
+    if fundamental_data is not None:
+        with fundamental_data:
+            statement_sections = {statement: st.container() for statement in STATEMENT_TITLES}
+
+    needed = set(HEADER_SOURCES)
+    for tab, container in tabs.items():
+        if container is not None:
+            needed.update(TAB_SOURCES[tab])
+
+    # Start every slow source at once so the page waits on the slowest one, not their sum
+    sources = {
+        'prices': (get_price_history, ticker, start_date, end_date),
+        'info': (get_ticker_info, ticker),
+        'news': (get_news, ticker),
+    }
+    for statement in STATEMENT_TITLES:
+        sources[statement] = (submit_statement, ticker, statement)
+    futures = start_fetches({name: source for name, source in sources.items() if name in needed and name not in memo})
+
+    memoized = [(name, memo[name], None) for name in needed if name in memo]
+    for name, result, error in chain(memoized, iter_resolved(futures)):
+        if not error:
+            memo[name] = result
+        if name == 'info':
+            with header:
+                if error:
+                    st.warning(f"Could not load market information for {ticker}: {error}")
+                else:
+                    render_header(ticker, result)
+        elif name == 'prices':
+            if error:
+                for section in (price_chart, pricing_data, prediction):
+                    if section is not None:
+                        with section:
+                            st.warning(f"Could not load price data for {ticker}: {error}")
+                continue
+            with price_chart:
+                render_price_chart(ticker, result)
+            if pricing_data is not None:
+                with pricing_data:
+                    render_pricing(add_daily_change(result))
+            if prediction is not None:
+                with prediction:
+                    render_prediction(ticker, add_daily_change(result))
+        elif name == 'news':
+            with news:
+                if error:
+                    st.warning(f"Could not load news for {ticker}: {error}")
+                else:
+                    render_news(ticker, result)
+        else:
+            with statement_sections[name]:
+                if error:
+                    st.subheader(STATEMENT_TITLES[name])
+                    st.warning(f"Could not load {STATEMENT_TITLES[name].lower()}: {error}")
+                else:
+                    render_statement(name, result)
+    render_fetch_stats()
     
     # FAQ Section
     st.markdown("---")
@@ -0,0 +1,108 @@
+import copy
+import hashlib
+import math
+import threading
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+# Same chronological split as train_test_split(..., test_size=0.2, shuffle=False)
+TEST_SIZE = 0.2
+
+
+class IncrementalLinearRegression:
+    """One-feature least squares kept as running sums of x, y, x² and xy.
+
+    `update` folds in new rows in O(rows added), so a model only ever pays
+    for bars it has not seen. Fits the same line as LinearRegression.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        self.n += len(x)
+        self.sum_x += x.sum()
+        self.sum_y += y.sum()
+        self.sum_xx += (x * x).sum()
+        self.sum_xy += (x * y).sum()
+        return self
+
+    @property
+    def coef_(self):
+        denominator = self.n * self.sum_xx - self.sum_x ** 2
+        if not denominator:
+            return 0.0
+        return (self.n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+
+    @property
+    def intercept_(self):
+        if not self.n:
+            return np.nan
+        return (self.sum_y - self.coef_ * self.sum_x) / self.n
+
+    def predict(self, X):
+        x = np.asarray(X, dtype=float).ravel()
+        return self.intercept_ + self.coef_ * x
+
+
+# Fitted models keyed by ticker and first bar date, shared across sessions
+model_cache = TTLCache(maxsize=4096, ttl=24 * 3600)
+_model_lock = threading.Lock()
+
+
+def prepare_features(data):
+    data = data.copy()
+    data['Date'] = data.index
+    data.reset_index(drop=True, inplace=True)
+    data['Days'] = (data['Date'] - data['Date'].min()).dt.days
+    return data
+
+
+def _fingerprint(rows):
+    digest = hashlib.sha1(rows['Days'].to_numpy(dtype=float).tobytes())
+    digest.update(rows['Adj Close'].to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def fit_linear_model(ticker, data):
+    """Return (data with Days/Predicted columns, model) for a price frame.
+
+    The model for a ticker and start date is cached. When the range grows by
+    new bars, only the rows that moved into the training split are added to
+    it instead of refitting from scratch. The cached model is used only if
+    the training rows it has seen, prices included, are unchanged.
+    """
+    data = prepare_features(data)
+    n_train = len(data) - math.ceil(TEST_SIZE * len(data))
+    key = (ticker.upper(), data['Date'].min())
+
+    with _model_lock:
+        entry = model_cache.get(key)
+        if entry is not None and (
+            entry['n_train'] > n_train
+            or _fingerprint(data.iloc[:entry['n_train']]) != entry['fingerprint']
+        ):
+            # The range shrank or the history changed (e.g. re-adjusted after a
+            # split), so the sums no longer apply
+            entry = None
+        if entry is None:
+            entry = {'model': IncrementalLinearRegression(), 'n_train': 0,
+                     'fingerprint': _fingerprint(data.iloc[:0])}
+        if n_train > entry['n_train']:
+            rows = data.iloc[entry['n_train']:n_train]
+            entry['model'].update(rows['Days'], rows['Adj Close'])
+            entry['n_train'] = n_train
+            entry['fingerprint'] = _fingerprint(data.iloc[:n_train])
+        model_cache.set(key, entry)
+        model = copy.copy(entry['model'])
+
+    data['Predicted'] = model.predict(data['Days'])
+    return data, model
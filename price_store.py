@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import yfinance as yf
+
+STORE_DIR = os.environ.get("PRICE_STORE_DIR", ".price_store")
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+# Bars are final by the exchange's calendar, not the server's (which may be a day ahead)
+EXCHANGE_TZ = ZoneInfo(os.environ.get("PRICE_STORE_EXCHANGE_TZ", "America/New_York"))
+# Relative change in a re-fetched bar that means history was re-adjusted
+READJUST_TOLERANCE = 1e-4
+
+
+def _to_date(value):
+    return pd.Timestamp(value).date()
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def exchange_today():
+    return datetime.now(EXCHANGE_TZ).date()
+
+
+def _readjusted(stored, fetched, day):
+    """True if the bar for `day` differs between the store and a fresh download."""
+    day = pd.Timestamp(day)
+    if day not in stored.index or day not in fetched.index:
+        return False
+    old = stored.loc[day, ['Close', 'Adj Close']].astype(float)
+    new = fetched.loc[day, ['Close', 'Adj Close']].astype(float)
+    return bool(((old - new).abs() > READJUST_TOLERANCE * new.abs()).any())
+
+
+def _download(ticker, start, end):
+    data = yf.download(ticker, start=start, end=end, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+
+class PriceStore:
+    """Persistent OHLCV store with one Parquet file per ticker.
+
+    Fetched coverage is kept next to the prices as half-open [start, end)
+    date ranges, the same convention yf.download uses, so weekends and
+    holidays inside a fetched range are not mistaken for missing data.
+    Only the gaps between a request and the stored coverage are downloaded.
+    """
+
+    def __init__(self, root=STORE_DIR, downloader=_download):
+        self.root = root
+        self.downloader = downloader
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, ticker):
+        name = ticker.upper()
+        return (os.path.join(self.root, f"{name}.parquet"),
+                os.path.join(self.root, f"{name}.json"))
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    def _read_ranges(self, ticker):
+        data_path, meta_path = self._paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return []
+        with open(meta_path) as f:
+            return [[date.fromisoformat(s), date.fromisoformat(e)] for s, e in json.load(f)["ranges"]]
+
+    def _read(self, ticker):
+        ranges = self._read_ranges(ticker)
+        if not ranges:
+            return None, []
+        return pd.read_parquet(self._paths(ticker)[0]), ranges
+
+    def _write(self, ticker, data, ranges):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        # Write to temporary files first so readers never see a half-written store
+        data.to_parquet(data_path + ".tmp")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"ranges": [[s.isoformat(), e.isoformat()] for s, e in ranges]}, f)
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def coverage(self, ticker):
+        # Only the small JSON sidecar; the Parquet file is not needed for this
+        with self._lock(ticker):
+            return self._read_ranges(ticker)
+
+    def missing_ranges(self, ticker, start, end, ranges=None):
+        """Return the [start, end) sub-ranges of the request not yet on disk."""
+        if ranges is None:
+            ranges = self.coverage(ticker)
+        start, end = _to_date(start), _to_date(end)
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in _merge_ranges(ranges):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _fetch_gaps(self, ticker, data, gaps):
+        """Download `gaps`; returns (frames, covered ranges), or None if `data` is stale.
+
+        Each download is widened to take in the stored bars on either side
+        of its gap. Splits and dividends re-adjust Close and Adj Close
+        backwards, so if either bar no longer matches, the stored rows are
+        on a different basis from the new ones and must not be mixed with
+        them.
+        """
+        frames, covered = [], []
+        for gap_start, gap_end in gaps:
+            anchors = []
+            if data is not None:
+                before = data.index[data.index < pd.Timestamp(gap_start)]
+                after = data.index[data.index >= pd.Timestamp(gap_end)]
+                anchors = [before[-1].date()] if len(before) else []
+                anchors += [after[0].date()] if len(after) else []
+            fetch_start = min([gap_start] + anchors)
+            fetch_end = max([gap_end] + [anchor + timedelta(days=1) for anchor in anchors])
+            fetched = self.downloader(ticker, fetch_start, fetch_end)
+            if any(_readjusted(data, fetched, anchor) for anchor in anchors):
+                return None
+            if not fetched.empty:
+                frames.append(fetched[COLUMNS])
+            # yf.download returns an empty frame instead of raising on network
+            # errors, so a gap with trading days is only stored once rows come back
+            elif len(pd.bdate_range(gap_start, gap_end - timedelta(days=1))):
+                continue
+            # The exchange's current session is still forming, so it is never marked as stored
+            covered_end = min(gap_end, exchange_today())
+            if gap_start < covered_end:
+                covered.append([gap_start, covered_end])
+        return frames, covered
+
+    def _remove(self, ticker):
+        for path in self._paths(ticker):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load(self, ticker, start, end):
+        """Return prices for [start, end), downloading only what is missing."""
+        start, end = _to_date(start), _to_date(end)
+        with self._lock(ticker):
+            data, ranges = self._read(ticker)
+            gaps = self.missing_ranges(ticker, start, end, ranges)
+            if gaps:
+                fetched = self._fetch_gaps(ticker, data, gaps)
+                if fetched is None:
+                    # History was re-adjusted upstream: drop the ticker and start over
+                    self._remove(ticker)
+                    data, ranges = None, []
+                    fetched = self._fetch_gaps(ticker, None, [(start, end)])
+                frames, covered = fetched
+                if data is not None:
+                    frames.insert(0, data)
+                ranges += covered
+                if frames:
+                    data = pd.concat(frames)
+                    data = data[~data.index.duplicated(keep='last')].sort_index()
+                    data.index.name = 'Date'
+                    self._write(ticker, data, _merge_ranges(ranges))
+
+        if data is None:
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+        mask = (data.index >= pd.Timestamp(start)) & (data.index < pd.Timestamp(end))
+        return data.loc[mask].copy()
+
+    def clear(self, ticker):
+        with self._lock(ticker):
+            self._remove(ticker)
@@ -0,0 +1,67 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from batch_analytics import METRICS, compute_metrics, metrics_frame, price_matrix, rolling_metrics
+from market_data import get_price_histories
+
+DEFAULT_TICKERS = "AAPL, MSFT, GOOGL, AMZN, NVDA, META, TSLA, JPM, V, KO"
+
+def parse_tickers(text):
+    tickers = []
+    for ticker in text.replace('\n', ',').split(','):
+        ticker = ticker.strip().upper()
+        if ticker and ticker not in tickers:
+            tickers.append(ticker)
+    return tickers
+
+def app():
+    st.title('🔎 Stock Screener')
+    st.write("""
+    Compare many stocks at once. Enter a list of stock symbols and a date range, and the screener ranks them by return and risk.
+    """)
+    st.markdown("---")
+
+    tickers = parse_tickers(st.text_area('Tickers (comma or line separated)', value=DEFAULT_TICKERS))
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        start_date = st.date_input('Start Date', pd.to_datetime('2020-01-01'), key='screener_start')
+    with col2:
+        end_date = st.date_input('End Date', pd.to_datetime('today'), key='screener_end')
+    with col3:
+        rank_by = st.selectbox('Rank by', METRICS, index=METRICS.index('Risk Adjusted Return'))
+    with col4:
+        window = st.number_input('Rolling window (days)', min_value=0, max_value=756, value=63,
+                                 help='Set to 0 to skip the rolling charts.')
+
+    if not tickers:
+        st.info('Enter at least one ticker.')
+        return
+
+    prices, errors = get_price_histories(tickers, start_date, end_date)
+    if errors:
+        st.warning("Skipped: " + ", ".join(f"{ticker} ({error})" for ticker, error in errors.items()))
+    if not prices:
+        return
+
+    # One aligned matrix and one vectorized pass for every ticker
+    dates, names, matrix = price_matrix(prices)
+    ranking = metrics_frame(names, compute_metrics(matrix)).sort_values(rank_by, ascending=False)
+    st.subheader('Ranking')
+    st.dataframe(ranking.style.format({
+        '% Change': '{:.2f}%',
+        'Annual Return': '{:.2f}%',
+        'Standard Deviation': '{:.2%}',
+        'Risk Adjusted Return': '{:.2f}',
+    }), use_container_width=True)
+
+    if window and len(dates) > window:
+        rolling = rolling_metrics(matrix, int(window))
+        metric = st.selectbox('Rolling metric', list(rolling), index=2)
+        chart = pd.DataFrame(rolling[metric], index=dates[window:], columns=names)
+        fig = px.line(chart, x=chart.index, y=list(ranking.index[:10]),
+                      labels={'value': metric, 'variable': 'Ticker', 'x': 'Date'},
+                      title=f'{window}-day Rolling {metric} (top 10)')
+        st.plotly_chart(fig, use_container_width=True)
+
+if __name__ == "__main__":
+    app()
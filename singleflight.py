@@ -0,0 +1,59 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Collapses concurrent identical calls into one.
+
+    Keys are tuples whose first item names the source (e.g. ('prices',
+    'AAPL', start, end)). The first caller for a key runs the function;
+    callers arriving while it is in flight wait for and share its result.
+    Cache hits served without a call can be recorded with `hit` so the
+    counts cover every request for a source.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._counts[key[0], 'miss'] += 1
+            else:
+                self._counts[key[0], 'coalesced'] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def hit(self, source):
+        with self._lock:
+            self._counts[source, 'hit'] += 1
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Return {source: {'hit': n, 'miss': n, 'coalesced': n}}."""
+        with self._lock:
+            stats = {}
+            for (source, outcome), count in self._counts.items():
+                stats.setdefault(source, {'hit': 0, 'miss': 0, 'coalesced': 0})[outcome] = count
+            return stats
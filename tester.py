@@ -1,12 +1,10 @@
 import streamlit as bt
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import plotly.express as px
+from charts import line_chart, paged_table
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
-from alpha_vantage.fundamentaldata import FundamentalData
-from stocknews import StockNews
+from market_data import get_news, get_price_history, get_statement
 
 def app():
     # Page title
@@ -18,13 +16,12 @@ def app():
     start_date = bt.date_input('Start Date', pd.to_datetime('2020-01-01'))
     end_date = bt.date_input('End Date', pd.to_datetime('today'))
 
-    # Fetch data from Yahoo Finance
-    data = yf.download(ticker, start=start_date, end=end_date)
+    # Fetch data from the local price store, downloading only missing dates
+    data = get_price_history(ticker, start_date, end_date)
 
     # Plot stock price data
     bt.subheader(f'{ticker} Stock Price')
-    fig = px.line(data, x=data.index, y='Adj Close', title=f'{ticker} Adjusted Close Price')
-    bt.plotly_chart(fig, use_container_width=True)
+    line_chart(data, None, 'Adj Close', key='price_zoom', title=f'{ticker} Adjusted Close Price')
 
     # Create tabs for different types of data
     pricing_data, fundamental_data, news, prediction = bt.tabs(["Pricing Data", "Fundamental Data", "Top 10 News", "Prediction"])
@@ -32,10 +29,9 @@ def app():
     # News Tab
     with news:
         bt.subheader(f'Top 10 News for {ticker}')
-        sn = StockNews(ticker, save_news=False)
-        df_news = sn.read_rss()
+        df_news = get_news(ticker)
         
-        for i in range(10):
+        for i in range(min(10, len(df_news))):
             bt.markdown(f"### News {i + 1}: {df_news['title'][i]}")
             bt.markdown(f"**Published on:** {df_news['published'][i]}")
             bt.markdown(f"**Summary:** {df_news['summary'][i]}")
@@ -61,35 +57,32 @@ def app():
         bt.subheader('Pricing Data')
         data['% Change'] = data['Adj Close'].pct_change()
         data.dropna(inplace=True)
-        bt.write(data)
+        paged_table(data, key='pricing_table')
         
         annual_return = data['% Change'].mean() * 252 * 100
         stdev = data['% Change'].std() * np.sqrt(252)
         
         bt.metric("Annual Return", f"{annual_return:.2f}%")
-        bt.metric("Standard Deviation", f"{stdev:.2f}%")
+        bt.metric("Standard Deviation", f"{stdev:.2%}")
         bt.metric("Risk Adjusted Return", f"{annual_return/stdev:.2f}")
 
     # Fundamental Data Tab
-    from alpha_vantage.fundamentaldata import FundamentalData
     with fundamental_data:
-        key = '1VZ9G6S9P6TTKQLF'
-        fd = FundamentalData(key,output_format = 'pandas')
         bt.subheader('Balance Sheet')
-        balance_sheet = fd.get_balance_sheet_annual(ticker)[0]
+        balance_sheet = get_statement(ticker, 'balance_sheet')
         bs = balance_sheet.T[2:]
         bs.columns = list(balance_sheet.T.iloc[0])
-        bt.write(bs)
+        paged_table(bs, key='balance_sheet')
         bt.subheader('Income Statement')
-        income_statement = fd.get_income_statement_annual(ticker)[0]
+        income_statement = get_statement(ticker, 'income_statement')
         is1 = income_statement.T[2:]
         is1.columns = list(income_statement.T.iloc[0])
-        bt.write(is1)
+        paged_table(is1, key='income_statement')
         bt.subheader('Cash Flow Statement')
-        cash_flow = fd.get_cash_flow_annual(ticker)[0]
+        cash_flow = get_statement(ticker, 'cash_flow')
         cf = cash_flow.T[2:]
         cf.columns = list(cash_flow.T.iloc[0])
-        bt.write(cf)
+        paged_table(cf, key='cash_flow')
 
     # Prediction Tab
     with prediction:
@@ -115,8 +108,7 @@ def app():
         data['Predicted'] = model.predict(X)
 
         # Plot the actual and predicted prices
-        fig_pred = px.line(data, x='Date', y=['Adj Close', 'Predicted'], labels={'value': 'Price', 'variable': 'Legend'}, title=f'{ticker} Stock Price Prediction')
-        bt.plotly_chart(fig_pred, use_container_width=True)
+        line_chart(data, 'Date', ['Adj Close', 'Predicted'], key='prediction_zoom', labels={'value': 'Price', 'variable': 'Legend'}, title=f'{ticker} Stock Price Prediction')
 
         # Future predictions
         days_to_predict = bt.slider('Days to Predict', 1, 365, 30)
@@ -128,8 +120,7 @@ def app():
         future_data = pd.DataFrame({'Date': future_dates, 'Predicted': future_predictions})
         
         # Plot future predictions
-        fig_future_pred = px.line(future_data, x='Date', y='Predicted', labels={'Predicted': 'Price'}, title=f'{ticker} Future Stock Price Prediction')
-        bt.plotly_chart(fig_future_pred, use_container_width=True)
+        line_chart(future_data, 'Date', 'Predicted', key='future_zoom', labels={'Predicted': 'Price'}, title=f'{ticker} Future Stock Price Prediction')
 
     # Run the application
     if __name__ == "__main__":
@@ -0,0 +1,168 @@
+"""In-memory stand-in for the parts of the Firestore client the posts code uses."""
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import firestore
+
+_ids = itertools.count()
+_clock = itertools.count()
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class Snapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = dict(data)
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class DocumentReference:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+
+class Change:
+    def __init__(self, document, old_index, new_index):
+        self.document = document
+        self.old_index = old_index
+        self.new_index = new_index
+
+
+class Watch:
+    def __init__(self, query, callback):
+        self.query = query
+        self.callback = callback
+        self.is_active = True
+        self.docs = []
+
+    def push(self):
+        """Deliver the changes since the last snapshot, like the real listener."""
+        new = self.query._results()
+        ids = [doc.id for doc in new]
+        changes = []
+        current = list(self.docs)
+        for index in reversed(range(len(current))):
+            if current[index].id not in ids:
+                changes.append(Change(current[index], index, -1))
+                del current[index]
+        for index, doc in enumerate(new):
+            if doc.id not in [d.id for d in current]:
+                current.insert(index, doc)
+                changes.append(Change(doc, -1, index))
+        self.docs = current
+        self.callback(new, changes, None)
+
+    def unsubscribe(self):
+        self.is_active = False
+        self.query.db.watches.remove(self)
+
+
+class Query:
+    def __init__(self, db, collection, orders=(), after=None, count=None):
+        self.db = db
+        self.collection = collection
+        self.orders = orders
+        self.after = after
+        self.count = count
+
+    def _replace(self, **changes):
+        fields = dict(orders=self.orders, after=self.after, count=self.count)
+        fields.update(changes)
+        return Query(self.db, self.collection, **fields)
+
+    def order_by(self, field, direction=firestore.Query.ASCENDING):
+        return self._replace(orders=self.orders + ((field, direction),))
+
+    def start_after(self, snapshot):
+        return self._replace(after=snapshot)
+
+    def limit(self, count):
+        return self._replace(count=count)
+
+    def _results(self):
+        docs = [Snapshot(DocumentReference(self.db, path), data)
+                for path, data in self.db.documents.items()
+                if path.startswith(self.collection + '/')]
+        for field, direction in reversed(self.orders):
+            docs.sort(key=lambda doc: doc.to_dict()[field], reverse=direction == firestore.Query.DESCENDING)
+        if self.after is not None:
+            ids = [doc.id for doc in docs]
+            docs = docs[ids.index(self.after.id) + 1:] if self.after.id in ids else []
+        return docs[:self.count] if self.count is not None else docs
+
+    def stream(self):
+        return iter(self._results())
+
+    def get(self, timeout=None):
+        return self._results()
+
+    def on_snapshot(self, callback):
+        watch = Watch(self, callback)
+        self.db.watches.append(watch)
+        watch.push()
+        return watch
+
+
+class CollectionReference(Query):
+    def document(self, document_id=None):
+        return DocumentReference(self.db, f"{self.collection}/{document_id or f'doc{next(_ids):06d}'}")
+
+
+class WriteBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, reference, data):
+        self.writes.append((reference.path, data))
+
+    def commit(self):
+        self.db.held += 1
+        self.db.gate.wait()
+        self.db.held -= 1
+        with self.db.lock:
+            if self.db.failures:
+                self.db.failures -= 1
+                raise RuntimeError("unavailable")
+            self.db.commits += 1
+            for path, data in self.writes:
+                stored = dict(data)
+                for field, value in data.items():
+                    if value is firestore.SERVER_TIMESTAMP:
+                        stored[field] = EPOCH + timedelta(seconds=next(_clock))
+                self.db.documents[path] = stored
+        for watch in list(self.db.watches):
+            watch.push()
+
+
+class FakeFirestore:
+    """Client with documents kept in a dict.
+
+    `failures` makes the next commits raise, and clearing `gate` holds
+    commits until it is set again; `held` counts commits waiting on it.
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.held = 0
+        self.documents = {}
+        self.watches = []
+        self.failures = 0
+        self.commits = 0
+        self.lock = threading.Lock()
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def document(self, path):
+        return DocumentReference(self, path)
+
+    def batch(self):
+        return WriteBatch(self)
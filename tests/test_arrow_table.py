@@ -0,0 +1,31 @@
+import pandas as pd
+
+from arrow_table import page, to_arrow, view
+
+
+def statement():
+    # Cached statements can mix ints and 'None' strings in one transposed column
+    return pd.DataFrame({'2023-12-31': [123, 'None', 5], '2022-12-31': ['7', 'None', 9]},
+                        index=['totalAssets', 'cashAndEquivalents', 'totalDebt'])
+
+
+def test_mixed_type_columns_convert():
+    key, table = to_arrow(statement())
+    assert table.num_rows == 3
+    assert page(view(key, table), 0).loc['totalAssets', '2023-12-31'] == '123'
+
+
+def test_key_depends_on_row_order():
+    data = statement()
+    assert to_arrow(data)[0] != to_arrow(data.iloc[::-1])[0]
+
+
+def test_filter_sort_and_page():
+    data = pd.DataFrame({'Close': range(120)}, index=pd.bdate_range('2024-01-01', periods=120, name='Date'))
+    key, table = to_arrow(data)
+    rows = view(key, table, sort_by='Close', descending=True, filter_text='2024-03')
+    first = page(rows, 0, page_size=5)
+    assert len(first) == 5
+    assert list(first['Close']) == sorted(first['Close'], reverse=True)
+    assert all(str(day).startswith('2024-03') for day in first.index)
+    assert page(rows, 100, page_size=5).empty
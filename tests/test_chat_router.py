@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import chat_router
+
+
+@pytest.fixture(autouse=True)
+def local_market_data(monkeypatch):
+    """Known symbols and canned data; records which lookups reach market_data."""
+    calls = []
+
+    def get_ticker_info(ticker):
+        calls.append(('info', ticker))
+        return {'shortName': 'Apple Inc.', 'currentPrice': 190.5, 'trailingPE': 29.123,
+                'marketCap': 3_000_000_000_000, 'dividendYield': 0.005}
+
+    def get_price_history(ticker, start, end):
+        calls.append(('prices', ticker))
+        index = pd.bdate_range('2024-01-01', periods=5, name='Date')
+        return pd.DataFrame({'Adj Close': [100.0, 101.0, 99.0, 102.0, 103.0]}, index=index)
+
+    monkeypatch.setattr(chat_router, 'is_known_ticker', lambda ticker: ticker in {'AAPL', 'TSLA', 'MSFT'})
+    monkeypatch.setattr(chat_router, 'get_ticker_info', get_ticker_info)
+    monkeypatch.setattr(chat_router, 'get_price_history', get_price_history)
+    return calls
+
+
+@pytest.mark.parametrize('prompt, metric', [
+    ("What is $AAPL's P/E?", 'trailingPE'),
+    ("What's the market cap of AAPL?", 'marketCap'),
+    ("What is TSLA's volatility?", 'Standard Deviation'),
+    ("How much is the dividend yield on $MSFT?", 'dividendYield'),
+    ("What type of stock is AAPL?", None),
+    ("Is TSLA a good hope for Europe?", None),
+])
+def test_find_metric(prompt, metric):
+    assert chat_router.find_metric(prompt) == metric
+
+
+@pytest.mark.parametrize('prompt, ticker', [
+    ("What is $aapl's price?", 'AAPL'),
+    ("What is AAPL trading at?", 'AAPL'),
+    ("What is a good ROE return?", None),
+    ("What is GDP growth risk?", None),
+])
+def test_find_ticker(prompt, ticker):
+    assert chat_router.find_ticker(prompt) == ticker
+
+
+@pytest.mark.parametrize('prompt', [
+    "Is $AAPL worth buying?",
+    "Should I buy $TSLA given the risk?",
+    "Why did $NVDA price drop today?",
+    "How do I calculate returns for $MSFT?",
+    "Explain DCF and the risk involved",
+    "What is a good ROE return?",
+])
+def test_open_ended_questions_go_to_the_llm(prompt, local_market_data):
+    assert chat_router.answer(prompt) is None
+    assert local_market_data == []
+
+
+def test_lookup_answers_from_ticker_info(local_market_data):
+    assert chat_router.answer("What is $AAPL's P/E ratio?") == "The trailing P/E ratio of Apple Inc. (AAPL) is 29.12."
+    assert local_market_data == [('info', 'AAPL')]
+
+
+def test_lookup_answers_from_price_history(local_market_data):
+    reply = chat_router.answer("What is AAPL's standard deviation?")
+    assert reply.startswith("AAPL's annualized standard deviation")
+    assert reply.endswith('%.')
+    assert local_market_data == [('prices', 'AAPL')]
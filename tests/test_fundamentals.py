@@ -0,0 +1,211 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+import fundamentals
+from fundamentals import FundamentalsCache, RequestScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=5 / 60, capacity=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(12)
+    bucket.acquire()
+    assert clock.now == pytest.approx(24)
+
+
+def test_token_bucket_refills_while_idle():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 10
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+
+def test_scheduler_coalesces_requests_for_the_same_key():
+    release = threading.Event()
+    calls = []
+
+    def fetch(ticker, statement):
+        calls.append((ticker, statement))
+        release.wait(5)
+        return f"{ticker} {statement}"
+
+    scheduler = RequestScheduler(fetch, TokenBucket(rate=1000, capacity=1000))
+    first = scheduler.submit('AAPL', 'cash_flow')
+    second = scheduler.submit('AAPL', 'cash_flow')
+    other = scheduler.submit('MSFT', 'cash_flow')
+    release.set()
+
+    assert first is second
+    assert first.result(5) == 'AAPL cash_flow'
+    assert other.result(5) == 'MSFT cash_flow'
+    assert calls == [('AAPL', 'cash_flow'), ('MSFT', 'cash_flow')]
+    assert scheduler.coalesced == 1
+
+
+def test_scheduler_passes_on_fetch_errors():
+    def fetch(ticker, statement):
+        raise RuntimeError("quota exceeded")
+
+    scheduler = RequestScheduler(fetch, TokenBucket(rate=1000, capacity=1000))
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        scheduler.submit('AAPL', 'balance_sheet').result(5)
+
+
+def statement_frame(total='123'):
+    return pd.DataFrame({'fiscalDateEnding': ['2023-12-31', '2022-12-31'],
+                         'totalAssets': [total, 'None']})
+
+
+def test_cache_round_trip_keeps_upstream_values(tmp_path):
+    cache = FundamentalsCache(tmp_path)
+    cache.write('AAPL', 'balance_sheet', statement_frame())
+    data, age = cache.read('aapl', 'balance_sheet')
+    pd.testing.assert_frame_equal(data, statement_frame())
+    assert age < 5
+
+
+@pytest.fixture
+def fake_upstream(tmp_path, monkeypatch):
+    """Point get_statement at a temporary cache and a fake Alpha Vantage."""
+    cache = FundamentalsCache(tmp_path)
+    calls = []
+    fetched = threading.Event()
+
+    def fetch_and_store(ticker, statement):
+        calls.append((ticker, statement))
+        data = statement_frame('456')
+        cache.write(ticker, statement, data)
+        fetched.set()
+        return data
+
+    monkeypatch.setattr(fundamentals, 'cache', cache)
+    monkeypatch.setattr(fundamentals, 'scheduler',
+                        RequestScheduler(fetch_and_store, TokenBucket(rate=1000, capacity=1000)))
+    return cache, calls, fetched
+
+
+def age_entry(cache, ticker, statement, seconds):
+    path = cache._path(ticker, statement)
+    with open(path) as f:
+        entry = json.load(f)
+    entry['fetched_at'] = time.time() - seconds
+    with open(path, 'w') as f:
+        json.dump(entry, f)
+
+
+def test_fresh_copy_is_served_without_a_request(fake_upstream):
+    cache, calls, _ = fake_upstream
+    cache.write('AAPL', 'cash_flow', statement_frame())
+    pd.testing.assert_frame_equal(fundamentals.get_statement('AAPL', 'cash_flow'), statement_frame())
+    assert calls == []
+
+
+def test_stale_copy_is_served_while_a_refresh_runs(fake_upstream):
+    cache, calls, fetched = fake_upstream
+    cache.write('AAPL', 'cash_flow', statement_frame())
+    age_entry(cache, 'AAPL', 'cash_flow', fundamentals.FRESH_FOR + 60)
+
+    future = fundamentals.submit_statement('AAPL', 'cash_flow')
+    assert future.done()
+    pd.testing.assert_frame_equal(future.result(), statement_frame())
+
+    assert fetched.wait(5)
+    assert calls == [('AAPL', 'cash_flow')]
+    pd.testing.assert_frame_equal(cache.read('AAPL', 'cash_flow')[0], statement_frame('456'))
+
+
+def test_missing_or_expired_copy_waits_for_upstream(fake_upstream):
+    cache, calls, _ = fake_upstream
+    pd.testing.assert_frame_equal(fundamentals.get_statement('MSFT', 'income_statement', timeout=5),
+                                  statement_frame('456'))
+
+    cache.write('TSLA', 'income_statement', statement_frame())
+    age_entry(cache, 'TSLA', 'income_statement', fundamentals.USABLE_FOR + 60)
+    pd.testing.assert_frame_equal(fundamentals.get_statement('TSLA', 'income_statement', timeout=5),
+                                  statement_frame('456'))
+    assert calls == [('MSFT', 'income_statement'), ('TSLA', 'income_statement')]
+
+
+def test_unknown_statement_is_rejected(fake_upstream):
+    with pytest.raises(ValueError):
+        fundamentals.get_statement('AAPL', 'quarterly_dividends')
+
+
+class FakeAlphaVantage(BaseHTTPRequestHandler):
+    """Answers FundamentalData statement calls with two annual reports."""
+
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.requests.append(query)
+        body = json.dumps({
+            'symbol': query['symbol'][0],
+            'annualReports': [
+                {'fiscalDateEnding': '2023-12-31', 'reportedCurrency': 'USD', 'totalAssets': '352583000000'},
+                {'fiscalDateEnding': '2022-12-31', 'reportedCurrency': 'USD', 'totalAssets': 'None'},
+            ],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_alpha_vantage():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAlphaVantage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeAlphaVantage.requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/query?"
+    server.shutdown()
+
+
+def test_fetch_statement_uses_alpha_vantage_url(fake_alpha_vantage, tmp_path):
+    # ALPHA_VANTAGE_URL is read at import time, so import fundamentals in a fresh interpreter
+    env = dict(os.environ, ALPHA_VANTAGE_URL=fake_alpha_vantage, ALPHA_VANTAGE_KEY='test-key',
+               FUNDAMENTALS_CACHE_DIR=str(tmp_path))
+    script = "import fundamentals; print(fundamentals.fetch_statement('AAPL', 'balance_sheet').to_json(orient='records'))"
+    result = subprocess.run([sys.executable, '-c', script], env=env, cwd=os.path.dirname(fundamentals.__file__),
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+    records = json.loads(result.stdout)
+    assert [record['fiscalDateEnding'] for record in records] == ['2023-12-31', '2022-12-31']
+    assert records[0]['totalAssets'] == '352583000000'
+    assert FakeAlphaVantage.requests == [{'function': ['BALANCE_SHEET'], 'symbol': ['AAPL'], 'apikey': ['test-key']}]
@@ -0,0 +1,67 @@
+import queue
+import time
+
+import pytest
+
+import post_writer
+from fake_firestore import FakeFirestore
+from post_writer import PostWriter
+from posts import POSTS, new_post
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(post_writer.time, 'sleep', lambda seconds: None)
+
+
+def test_writer_retries_failed_batches(no_backoff):
+    db = FakeFirestore()
+    db.failures = 2
+    writer = PostWriter(db, flush_interval=0.01)
+    post_id = writer.submit(new_post('user@example.com', 'hello'))
+    wait_for(lambda: writer.written == 1)
+    assert writer.failed == set()
+    assert db.documents[f'{POSTS}/{post_id}']['Content'] == 'hello'
+
+
+def test_writer_gives_up_after_max_retries(no_backoff):
+    db = FakeFirestore()
+    db.failures = 100
+    writer = PostWriter(db, flush_interval=0.01, max_retries=3)
+    post_id = writer.submit(new_post('user@example.com', 'lost'))
+    wait_for(lambda: writer.failed)
+    assert writer.failed == {post_id}
+    assert db.documents == {}
+
+
+def test_writer_batches_queued_posts():
+    db = FakeFirestore()
+    db.gate.clear()
+    writer = PostWriter(db, flush_interval=0.01)
+    writer.submit(new_post('user@example.com', 'first'))
+    wait_for(lambda: db.held == 1)
+    for i in range(5):
+        writer.submit(new_post('user@example.com', f'queued {i}'))
+    db.gate.set()
+    wait_for(lambda: writer.written == 6)
+    assert writer.batches == 2
+
+
+def test_writer_applies_backpressure():
+    db = FakeFirestore()
+    db.gate.clear()
+    writer = PostWriter(db, flush_interval=0.01, max_pending=1)
+    writer.submit(new_post('user@example.com', 'in flight'))
+    wait_for(lambda: db.held == 1)
+    writer.submit(new_post('user@example.com', 'queued'))
+    with pytest.raises(queue.Full):
+        writer.submit(new_post('user@example.com', 'rejected'), timeout=0.05)
+    db.gate.set()
+    wait_for(lambda: writer.written == 2)
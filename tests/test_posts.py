@@ -0,0 +1,55 @@
+from fake_firestore import FakeFirestore
+from post_feed import PostFeed
+from posts import POSTS, fetch_posts_page, new_post
+
+
+def add_posts(db, count, author='user@example.com'):
+    for i in range(count):
+        batch = db.batch()
+        batch.set(db.collection(POSTS).document(), new_post(author, f'post {i}'))
+        batch.commit()
+
+
+def contents(posts):
+    return [post['Content'] for post in posts]
+
+
+def test_cursor_paging_walks_every_post_once():
+    db = FakeFirestore()
+    add_posts(db, 45)
+    pages, cursor = [], None
+    while True:
+        posts, cursor = fetch_posts_page(db, 20, cursor)
+        pages.append(contents(posts))
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [20, 20, 5]
+    assert sum(pages, []) == [f'post {i}' for i in reversed(range(45))]
+
+
+def test_feed_buffers_the_newest_posts_and_pages_past_them():
+    db = FakeFirestore()
+    add_posts(db, 25)
+    feed = PostFeed(db, size=10).start()
+    assert feed.wait_ready(1)
+    assert feed.is_full()
+    assert contents(feed.recent(3)) == ['post 24', 'post 23', 'post 22']
+
+    older, _ = fetch_posts_page(db, 20, feed.oldest_snapshot())
+    assert contents(older) == [f'post {i}' for i in reversed(range(15))]
+
+    add_posts(db, 2, author='new@example.com')
+    assert len(feed.recent()) == 10
+    assert contents(feed.recent(3)) == ['post 1', 'post 0', 'post 24']
+    assert feed.oldest_snapshot().to_dict()['Content'] == 'post 17'
+    feed.stop()
+    assert not feed.is_alive()
+
+
+def test_feed_that_is_not_full():
+    db = FakeFirestore()
+    add_posts(db, 3)
+    feed = PostFeed(db, size=10).start()
+    assert feed.wait_ready(1)
+    assert not feed.is_full()
+    assert contents(feed.recent()) == ['post 2', 'post 1', 'post 0']
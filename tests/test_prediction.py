@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import train_test_split
+
+from prediction import IncrementalLinearRegression, fit_linear_model, model_cache, prepare_features
+
+
+def prices(days=300, scale=1.0):
+    index = pd.bdate_range('2023-01-02', periods=days, name='Date')
+    closes = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, days))
+    return pd.DataFrame({'Adj Close': closes * scale}, index=index)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    model_cache.clear()
+
+
+def sklearn_fit(data):
+    data = prepare_features(data)
+    X_train, _, y_train, _ = train_test_split(data[['Days']], data['Adj Close'], test_size=0.2, shuffle=False)
+    return LinearRegression().fit(X_train, y_train)
+
+
+def test_matches_linear_regression_on_the_training_split():
+    data = prices()
+    _, model = fit_linear_model('AAPL', data)
+    expected = sklearn_fit(data)
+    assert model.coef_ == pytest.approx(expected.coef_[0])
+    assert model.intercept_ == pytest.approx(expected.intercept_)
+
+
+def test_incremental_update_matches_a_full_fit():
+    data = prices(400)
+    fit_linear_model('AAPL', data.iloc[:300])
+    _, model = fit_linear_model('AAPL', data)
+    expected = sklearn_fit(data)
+    assert model.coef_ == pytest.approx(expected.coef_[0])
+    assert model.intercept_ == pytest.approx(expected.intercept_)
+
+
+def test_readjusted_prices_refit():
+    fit_linear_model('AAPL', prices())
+    _, model = fit_linear_model('AAPL', prices(scale=0.5))
+    expected = sklearn_fit(prices(scale=0.5))
+    assert model.coef_ == pytest.approx(expected.coef_[0])
+    assert model.intercept_ == pytest.approx(expected.intercept_)
+
+
+def test_update_in_pieces_equals_one_update():
+    x, y = np.arange(50.0), np.arange(50.0) * 2 + 3
+    whole = IncrementalLinearRegression().update(x, y)
+    pieces = IncrementalLinearRegression().update(x[:20], y[:20]).update(x[20:], y[20:])
+    assert pieces.coef_ == pytest.approx(whole.coef_)
+    assert pieces.intercept_ == pytest.approx(whole.intercept_)
+    assert whole.coef_ == pytest.approx(2)
+    assert whole.intercept_ == pytest.approx(3)
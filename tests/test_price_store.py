@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from price_store import COLUMNS, PriceStore
+
+
+class FakeDownloader:
+    """Serves bars for every weekday from a fixed price table."""
+
+    def __init__(self, factor=1.0):
+        self.factor = factor
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((start, end))
+        index = pd.bdate_range(start, end - timedelta(days=1), name='Date')
+        prices = [float(1 + day.toordinal() % 100) * self.factor for day in index]
+        return pd.DataFrame({column: prices for column in COLUMNS}, index=index)
+
+
+def test_missing_ranges_subtracts_stored_coverage(tmp_path):
+    store = PriceStore(tmp_path)
+    ranges = [[date(2024, 1, 1), date(2024, 2, 1)], [date(2024, 3, 1), date(2024, 4, 1)]]
+    assert store.missing_ranges('AAPL', date(2024, 1, 15), date(2024, 3, 15), ranges) == [
+        (date(2024, 2, 1), date(2024, 3, 1)),
+    ]
+    assert store.missing_ranges('AAPL', date(2023, 12, 1), date(2024, 5, 1), ranges) == [
+        (date(2023, 12, 1), date(2024, 1, 1)),
+        (date(2024, 2, 1), date(2024, 3, 1)),
+        (date(2024, 4, 1), date(2024, 5, 1)),
+    ]
+    assert store.missing_ranges('AAPL', date(2024, 1, 5), date(2024, 1, 20), ranges) == []
+
+
+def test_load_downloads_only_the_gaps(tmp_path):
+    downloader = FakeDownloader()
+    store = PriceStore(tmp_path, downloader)
+    store.load('AAPL', date(2024, 1, 1), date(2024, 2, 1))
+    downloader.calls.clear()
+
+    data = store.load('AAPL', date(2024, 1, 15), date(2024, 3, 1))
+    # The new gap is fetched from the last stored bar so it can be compared
+    assert downloader.calls == [(date(2024, 1, 31), date(2024, 3, 1))]
+    assert data.index.min() == pd.Timestamp(2024, 1, 15)
+    assert data.index.max() == pd.Timestamp(2024, 2, 29)
+    assert not data.index.duplicated().any()
+    assert store.missing_ranges('AAPL', date(2024, 1, 1), date(2024, 3, 1)) == []
+
+
+def test_readjusted_history_invalidates_the_store(tmp_path):
+    store = PriceStore(tmp_path, FakeDownloader())
+    store.load('AAPL', date(2023, 1, 1), date(2024, 2, 1))
+
+    # A 2-for-1 split halves every past price upstream
+    split = FakeDownloader(factor=0.5)
+    store.downloader = split
+    data = store.load('AAPL', date(2024, 1, 1), date(2024, 3, 1))
+    assert split.calls[-1] == (date(2024, 1, 1), date(2024, 3, 1))
+    expected = split('AAPL', date(2024, 1, 1), date(2024, 3, 1))
+    pd.testing.assert_series_equal(data['Adj Close'], expected['Adj Close'], check_freq=False)
+    assert store.coverage('AAPL') == [[date(2024, 1, 1), date(2024, 3, 1)]]
+
+
+def test_backward_extension_after_split_refetches(tmp_path):
+    store = PriceStore(tmp_path, FakeDownloader())
+    store.load('AAPL', date(2024, 1, 1), date(2024, 3, 1))
+
+    split = FakeDownloader(factor=0.5)
+    store.downloader = split
+    data = store.load('AAPL', date(2023, 6, 1), date(2024, 3, 1))
+    # The first stored bar after the new gap no longer matches, so nothing old is kept
+    expected = split('AAPL', date(2023, 6, 1), date(2024, 3, 1))
+    pd.testing.assert_series_equal(data['Adj Close'], expected['Adj Close'], check_freq=False)
+
+
+def test_empty_download_is_not_marked_as_stored(tmp_path):
+    downloader = FakeDownloader()
+    store = PriceStore(tmp_path, lambda ticker, start, end: downloader(ticker, start, start))
+    store.load('AAPL', date(2024, 1, 1), date(2024, 2, 1))
+    assert store.coverage('AAPL') == []
+
+    store.downloader = downloader
+    store.load('AAPL', date(2024, 1, 1), date(2024, 2, 1))
+    assert store.coverage('AAPL') == [[date(2024, 1, 1), date(2024, 2, 1)]]
+
+
+def test_weekend_only_gap_is_stored_without_rows(tmp_path):
+    store = PriceStore(tmp_path, FakeDownloader())
+    store.load('AAPL', date(2024, 1, 1), date(2024, 1, 6))
+    store.load('AAPL', date(2024, 1, 6), date(2024, 1, 8))
+    assert store.coverage('AAPL') == [[date(2024, 1, 1), date(2024, 1, 8)]]
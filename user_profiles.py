@@ -0,0 +1,128 @@
+"""Cached user profiles and local Firebase ID token verification.
+
+Logins resolve a profile from the cache before falling back to the Admin
+API, and ID tokens are checked against Google's signing certificates,
+which are fetched once and refreshed when they expire. Login spikes
+therefore cost at most one Admin API call per user per PROFILE_TTL.
+"""
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import requests
+from firebase_admin import auth
+from google.auth import jwt
+
+from firebase_client import get_app
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+
+CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+SIGN_IN_URL = "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword"
+# Password sign-in needs the project's web API key; without it logins are by email only
+WEB_API_KEY = os.environ.get("FIREBASE_WEB_API_KEY")
+PROFILE_TTL = 600
+# Used when the certificate response carries no max-age
+DEFAULT_CERTS_TTL = 3600
+
+Profile = namedtuple('Profile', ['uid', 'email', 'display_name'])
+
+profile_cache = TTLCache(maxsize=10000, ttl=PROFILE_TTL)
+lookups = SingleFlight()
+
+
+def _key(email):
+    return email.strip().lower()
+
+
+def _profile(user):
+    return Profile(user.uid, user.email, user.display_name)
+
+
+def remember(profile):
+    profile_cache.set(_key(profile.email), profile)
+    return profile
+
+
+def forget(email):
+    profile_cache.pop(_key(email))
+
+
+def get_profile(email):
+    """Return the profile for `email`, calling the Admin API only on a cache miss."""
+    profile = profile_cache.get(_key(email))
+    if profile is not None:
+        return profile
+    # Concurrent logins for the same address share one Admin API call
+    user = lookups.do(_key(email), auth.get_user_by_email, email)
+    return remember(_profile(user))
+
+
+def create_user(email, password, display_name):
+    """Create a Firebase user and prime the cache with the new profile."""
+    forget(email)
+    user = auth.create_user(email=email, password=password, display_name=display_name)
+    return remember(_profile(user))
+
+
+class SigningKeys:
+    """Google's token signing certificates, refreshed as their max-age expires."""
+
+    def __init__(self, url=CERTS_URL):
+        self.url = url
+        self._certs = {}
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        response = requests.get(self.url, timeout=10)
+        response.raise_for_status()
+        match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+        self._certs = response.json()
+        self._expires = time.monotonic() + (int(match.group(1)) if match else DEFAULT_CERTS_TTL)
+
+    def get(self, kid=None):
+        with self._lock:
+            # Refresh early when a token names a key we have not seen (key rotation)
+            if time.monotonic() >= self._expires or (kid and kid not in self._certs):
+                self._refresh()
+            return self._certs
+
+
+signing_keys = SigningKeys()
+
+
+def verify_id_token(id_token):
+    """Verify a Firebase ID token locally and return the profile it carries."""
+    project_id = get_app().project_id
+    header = jwt.decode_header(id_token)
+    claims = jwt.decode(id_token, certs=signing_keys.get(header.get('kid')), audience=project_id)
+    if claims.get('iss') != f"https://securetoken.google.com/{project_id}":
+        raise ValueError("ID token has an unexpected issuer")
+    if not claims.get('sub'):
+        raise ValueError("ID token has no subject")
+    profile = Profile(claims['sub'], claims.get('email'), claims.get('name'))
+    return remember(profile) if profile.email else profile
+
+
+def sign_in(email, password):
+    """Sign a user in and return their profile.
+
+    With FIREBASE_WEB_API_KEY set, the password is checked by the Firebase
+    Auth REST API and the returned ID token is verified locally. Without a
+    key this falls back to a cached lookup by email.
+    """
+    if not WEB_API_KEY:
+        return get_profile(email)
+    response = requests.post(
+        SIGN_IN_URL,
+        params={'key': WEB_API_KEY},
+        json={'email': email, 'password': password, 'returnSecureToken': True},
+        timeout=10,
+    )
+    if not response.ok:
+        message = response.json().get('error', {}).get('message', response.reason)
+        raise ValueError(message)
+    return verify_id_token(response.json()['idToken'])